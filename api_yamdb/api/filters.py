@@ -1,18 +1,140 @@
+from core.search import get_backend
+from django.db.models import Q
 from django_filters import FilterSet, rest_framework
 
-from reviews.models import Title
+from reviews.genres import get_genre_mask
+from reviews.models import Comments, Review, Title, TitlesGenres
+from reviews.search import TITLES_INDEX
+from reviews.slugs import CATEGORIES, GENRES
 
 
 class TitleFilter(FilterSet):
     """Фильтрует выдачу произведений."""
 
-    genre = rest_framework.CharFilter(field_name='genre__slug')
-    category = rest_framework.CharFilter(field_name='category__slug')
-    name = rest_framework.CharFilter(
-        field_name='name',
-        lookup_expr='icontains'
+    GENRE_MODES = (('any', 'any'), ('all', 'all'))
+
+    genre = rest_framework.CharFilter(method='filter_genre')
+    genre_mode = rest_framework.ChoiceFilter(
+        choices=GENRE_MODES, method='filter_genre_mode'
+    )
+    category = rest_framework.CharFilter(method='filter_category')
+    name = rest_framework.CharFilter(method='filter_name')
+    year_min = rest_framework.NumberFilter(
+        field_name='year', lookup_expr='gte'
+    )
+    year_max = rest_framework.NumberFilter(
+        field_name='year', lookup_expr='lte'
+    )
+    rating_min = rest_framework.NumberFilter(
+        field_name='rating', lookup_expr='gte'
+    )
+    rating_max = rest_framework.NumberFilter(
+        field_name='rating', lookup_expr='lte'
     )
 
     class Meta:
         model = Title
-        fields = ('genre', 'category', 'name', 'year')
+        fields = ('genre', 'genre_mode', 'category', 'name', 'year',
+                  'year_min', 'year_max', 'rating_min', 'rating_max')
+
+    def filter_genre(self, queryset, name, value):
+        """Фильтрует произведения по slug жанров через маску жанров.
+
+        Жанры перечисляются через запятую, genre_mode=all оставляет
+        произведения со всеми жанрами, genre_mode=any (по умолчанию) - хотя
+        бы с одним. Жанры без бита в маске фильтруются через таблицу
+        связей подзапросом, поэтому строки не дублируются.
+
+        Args:
+            queryset (QuerySet): запрос.
+            name (str): название фильтра.
+            value (str): slug жанров через запятую.
+
+        Returns:
+            QuerySet: произведения жанров.
+        """
+
+        match_all = self.form.cleaned_data.get('genre_mode') == 'all'
+        genres = [GENRES.get(slug.strip()) for slug in value.split(',')]
+        if match_all and None in genres:
+            return queryset.none()
+        genres = [genre for genre in genres if genre is not None]
+        if not genres:
+            return queryset.none()
+        mask = get_genre_mask(genres)
+        conditions = [
+            Q(pk__in=TitlesGenres.objects.filter(
+                genre_id=genre.pk
+            ).values('title_id'))
+            for genre in genres if genre.bit is None
+        ]
+        if mask:
+            lookup = 'genre_mask__has_all' if match_all else (
+                'genre_mask__has_any'
+            )
+            conditions.append(Q(**{lookup: mask}))
+        condition = Q()
+        for part in conditions:
+            condition = condition & part if match_all else condition | part
+        return queryset.filter(condition)
+
+    def filter_genre_mode(self, queryset, name, value):
+        """Режим фильтра genre, сам по себе запрос не меняет."""
+
+        return queryset
+
+    def filter_category(self, queryset, name, value):
+        """Фильтрует произведения по slug категории без JOIN с
+        категориями.
+
+        Args:
+            queryset (QuerySet): запрос.
+            name (str): название фильтра.
+            value (str): slug категории.
+
+        Returns:
+            QuerySet: произведения категории.
+        """
+
+        category_id = CATEGORIES.get_id(value)
+        if category_id is None:
+            return queryset.none()
+        return queryset.filter(category_id=category_id)
+
+    def filter_name(self, queryset, name, value):
+        """Фильтрует произведения по словам из названия.
+
+        Args:
+            queryset (QuerySet): запрос.
+            name (str): название фильтра.
+            value (str): строка поиска.
+
+        Returns:
+            QuerySet: произведения, в названии которых есть слова,
+            начинающиеся со слов из строки поиска.
+        """
+
+        return get_backend().filter(queryset, TITLES_INDEX, value, ('name',))
+
+
+class ReviewFilter(FilterSet):
+    """Фильтрует выдачу отзывов."""
+
+    title = rest_framework.NumberFilter(field_name='title_id')
+    author = rest_framework.CharFilter(field_name='author__username')
+
+    class Meta:
+        model = Review
+        fields = ('title', 'author')
+
+
+class CommentFilter(FilterSet):
+    """Фильтрует выдачу комментариев."""
+
+    title = rest_framework.NumberFilter(field_name='review__title_id')
+    review = rest_framework.NumberFilter(field_name='review_id')
+    author = rest_framework.CharFilter(field_name='author__username')
+
+    class Meta:
+        model = Comments
+        fields = ('title', 'review', 'author')
@@ -11,6 +11,15 @@ class IsAdmin(BasePermission):
                 and request.user.is_admin)
 
 
+class IsModerator(BasePermission):
+    """Разрешает доступ только модераторам и администраторам."""
+
+    def has_permission(self, request, view):
+        return (not request.user.is_anonymous
+                and (request.user.role == User.MODERATOR
+                     or request.user.is_admin))
+
+
 class IsAdminOrReadOnly(BasePermission):
     """Разрешает доступ всем пользователям если метод запроса среди безопасных,
      либо если пользователь является администратором.
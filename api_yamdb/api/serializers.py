@@ -1,9 +1,16 @@
-from core.mixins import ValidateMixin
-from rest_framework import generics, serializers
+from core.mixins import SparseFieldsMixin, ValidateMixin
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from reviews.bulk import bulk_create_titles, bulk_update_titles
 from reviews.models import Category, Comments, Genre, Review, Title, User
+from reviews.slugs import CATEGORIES, GENRES
 
+BULK_DELETE_MAX_SIZE = 5000
 
-class UserSerializer(ValidateMixin, serializers.ModelSerializer):
+
+class UserSerializer(ValidateMixin, SparseFieldsMixin,
+                     serializers.ModelSerializer):
     """Сериализатор для работы с пользователями."""
 
     class Meta:
@@ -49,7 +56,7 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class ReadTitleSerializer(serializers.ModelSerializer):
+class ReadTitleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для получения списка произведений."""
 
     category = CategorySerializer()
@@ -63,17 +70,35 @@ class ReadTitleSerializer(serializers.ModelSerializer):
         read_only_fields = ('__all__',)
 
 
+class SlugMapRelatedField(serializers.SlugRelatedField):
+    """Связанное поле по slug, которое ищет объекты в SlugMap без
+    запросов к базе данных.
+    """
+
+    def __init__(self, slug_map, **kwargs):
+        self.slug_map = slug_map
+        kwargs.setdefault('slug_field', 'slug')
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        instance = self.slug_map.get(data)
+        if instance is None:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=str(data))
+        return instance
+
+
 class WriteTitleSerializer(serializers.ModelSerializer):
     """Сериализатор для создания произведения."""
 
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(),
-        slug_field='slug'
+    category = SlugMapRelatedField(
+        CATEGORIES,
+        queryset=Category.objects.all()
     )
-    genre = serializers.SlugRelatedField(
+    genre = SlugMapRelatedField(
+        GENRES,
         queryset=Genre.objects.all(),
-        many=True,
-        slug_field='slug'
+        many=True
     )
 
     class Meta:
@@ -81,7 +106,105 @@ class WriteTitleSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'year', 'description', 'genre', 'category')
 
 
-class ReviewsSerializer(serializers.ModelSerializer):
+class BulkTitleListSerializer(serializers.ListSerializer):
+    """Сериализатор для пакетного создания и изменения произведений.
+
+    Слаги категорий и жанров всех произведений проверяются по SlugMap без
+    запросов к базе данных, произведения сохраняются пакетно.
+    """
+
+    def resolve_slugs(self, items, slug_map, field, errors):
+        """Заменяет слаги из поля field объектами из slug_map.
+
+        Args:
+            items (list): проверенные данные произведений.
+            slug_map (SlugMap): соответствие slug <-> id категорий или
+            жанров.
+            field (str): поле со слагом или списком слагов.
+            errors (list): ошибки по каждому произведению.
+        """
+
+        slugs = set()
+        for item in items:
+            value = item.get(field)
+            if value is not None:
+                slugs.update(value if isinstance(value, list) else [value])
+        objects = {slug: slug_map.get(slug) for slug in slugs}
+        message = serializers.SlugRelatedField.default_error_messages[
+            'does_not_exist'
+        ]
+        for item, item_errors in zip(items, errors):
+            value = item.get(field)
+            if value is None:
+                continue
+            many = isinstance(value, list)
+            missing = [slug for slug in (value if many else [value])
+                       if objects[slug] is None]
+            if missing:
+                item_errors[field] = [
+                    message.format(slug_name='slug', value=slug)
+                    for slug in missing
+                ]
+            elif many:
+                item[field] = [objects[slug] for slug in value]
+            else:
+                item[field] = objects[value]
+
+    def to_internal_value(self, data):
+        """Проверяет данные и заменяет слаги объектами.
+
+        Args:
+            data (list): данные произведений.
+
+        Raises:
+            serializers.ValidationError: ошибки по каждому произведению.
+
+        Returns:
+            list: проверенные данные.
+        """
+
+        items = super().to_internal_value(data)
+        errors = [{} for item in items]
+        for item, item_errors in zip(items, errors):
+            if self.instance is None:
+                item.pop('id', None)
+            elif item.get('id') not in self.instance:
+                item_errors['id'] = ['Произведение не найдено.']
+        self.resolve_slugs(items, CATEGORIES, 'category', errors)
+        self.resolve_slugs(items, GENRES, 'genre', errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        return bulk_create_titles(validated_data)
+
+    def update(self, instance, validated_data):
+        return bulk_update_titles([
+            (instance[item['id']],
+             {key: value for key, value in item.items() if key != 'id'})
+            for item in validated_data
+        ])
+
+
+class BulkTitleSerializer(serializers.ModelSerializer):
+    """Сериализатор произведения для пакетного создания и изменения.
+
+    Используется только с many=True, при изменении instance - словарь
+    произведений по id.
+    """
+
+    id = serializers.IntegerField(required=False)
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+        list_serializer_class = BulkTitleListSerializer
+
+
+class ReviewsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для работы с отзывами."""
 
     author = serializers.SlugRelatedField(
@@ -91,44 +214,66 @@ class ReviewsSerializer(serializers.ModelSerializer):
     )
     score = serializers.IntegerField(min_value=1, max_value=10)
 
-    def validate(self, data):
-        """Валидация отзывов.
+    def create(self, validated_data):
+        """Создает отзыв.
+
+        Повторный отзыв отклоняет ограничение unique_review в базе
+        данных, поэтому проверка не требует отдельного запроса и работает
+        при параллельных запросах.
 
         Args:
-            data (dict): словарь с данными для валидации.
+            validated_data (dict): проверенные данные отзыва.
 
         Raises:
             serializers.ValidationError: ошибка при попытке оставить более
             одного отзыва.
 
         Returns:
-            dict: словарь с проверенными данными.
+            Review: созданный отзыв.
         """
 
-        if self.context['request'].method != 'POST':
-            return data
-        title = generics.get_object_or_404(
-            Title,
-            id=self.context['request'].parser_context['kwargs'].get(
-                'title_id')
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author']
+            ).exists():
+                raise
+        raise serializers.ValidationError(
+            detail={api_settings.NON_FIELD_ERRORS_KEY: [
+                'На произведение можно оставить не более одного отзыва'
+            ]},
+            code=400
         )
-        if Review.objects.filter(
-            title_id=title.id,
-            author=self.context['request'].user
-        ).exists():
-            raise serializers.ValidationError(
-                detail=('На произведение можно оставить '
-                        'не более одного отзыва'),
-                code=400
-            )
-        return data
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = ('id', 'text', 'author', 'score', 'pub_date',
+                  'comments_count', 'last_comment_date')
+
 
+class ReviewSearchSerializer(ReviewsSerializer):
+    """Сериализатор для поиска по всем отзывам."""
 
-class CommentsSerializer(serializers.ModelSerializer):
+    class Meta(ReviewsSerializer.Meta):
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+        read_only_fields = fields
+
+
+class ReviewFeedSerializer(ReviewSearchSerializer):
+    """Сериализатор ленты последних отзывов."""
+
+    title_name = serializers.CharField(source='title.name', read_only=True)
+
+    class Meta(ReviewSearchSerializer.Meta):
+        fields = ('id', 'title', 'title_name', 'text', 'author', 'score',
+                  'pub_date')
+        read_only_fields = fields
+
+
+class CommentsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для работы с комментариями."""
 
     author = serializers.SlugRelatedField(
@@ -152,11 +297,7 @@ class CommentsSerializer(serializers.ModelSerializer):
 
         if self.context['request'].method != 'POST':
             return data
-        title = generics.get_object_or_404(
-            Title,
-            id=self.context['request'].parser_context['kwargs'].get(
-                'title_id')
-        )
+        title = self.context['view'].get_title()
         if not Review.objects.filter(
             title_id=title.id,
             author=self.context['request'].user
@@ -170,3 +311,64 @@ class CommentsSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comments
         fields = ('id', 'text', 'author', 'pub_date')
+
+
+class CommentSearchSerializer(CommentsSerializer):
+    """Сериализатор для поиска по всем комментариям."""
+
+    title = serializers.PrimaryKeyRelatedField(
+        source='review.title',
+        read_only=True
+    )
+
+    class Meta(CommentsSerializer.Meta):
+        fields = ('id', 'title', 'review', 'text', 'author', 'pub_date')
+        read_only_fields = fields
+
+
+class CommentFeedSerializer(CommentSearchSerializer):
+    """Сериализатор ленты последних комментариев."""
+
+    title_name = serializers.CharField(
+        source='review.title.name',
+        read_only=True
+    )
+
+    class Meta(CommentSearchSerializer.Meta):
+        fields = ('id', 'title', 'title_name', 'review', 'text', 'author',
+                  'pub_date')
+        read_only_fields = fields
+
+
+class BulkDeleteSerializer(serializers.Serializer):
+    """Условия пакетного удаления отзывов или комментариев.
+
+    Удаляются объекты, подходящие под все переданные условия.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_DELETE_MAX_SIZE,
+        required=False
+    )
+    author = serializers.CharField(required=False)
+
+    def validate(self, data):
+        """Проверяет, что передано хотя бы одно условие.
+
+        Args:
+            data (dict): словарь с данными для валидации.
+
+        Raises:
+            serializers.ValidationError: ошибка при отсутствии условий.
+
+        Returns:
+            dict: словарь с проверенными данными.
+        """
+
+        if not data:
+            raise serializers.ValidationError(
+                'Укажите id объектов (ids) или автора (author)'
+            )
+        return data
@@ -0,0 +1,58 @@
+import asyncio
+from functools import partial
+
+from core.events import publish
+from core.sse import EventStream
+from django.db import close_old_connections, transaction
+from reviews.models import Title
+
+
+def get_title_channel(title_id):
+    """Возвращает канал событий произведения."""
+
+    return f'titles:{title_id}'
+
+
+def publish_title_event(title_id, event, data):
+    """Публикует событие произведения после фиксации транзакции.
+
+    Args:
+        title_id (int): id произведения.
+        event (str): тип события: review или comment.
+        data (dict): данные, выводимые сериализатором.
+    """
+
+    transaction.on_commit(partial(
+        publish, get_title_channel(title_id), event, data
+    ))
+
+
+def _title_exists(title_id):
+    close_old_connections()
+    try:
+        return Title.objects.filter(pk=title_id).exists()
+    finally:
+        close_old_connections()
+
+
+async def get_title_events_channel(scope):
+    """Возвращает канал произведения из url либо None, если его нет.
+
+    Запрос к базе данных выполняется в пуле потоков, чтобы не блокировать
+    цикл событий.
+
+    Args:
+        scope (dict): scope запроса ASGI.
+
+    Returns:
+        str: название канала.
+    """
+
+    title_id = int(scope['url_route']['kwargs']['title_id'])
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(None, _title_exists, title_id):
+        return None
+    return get_title_channel(title_id)
+
+
+title_events = EventStream(get_title_events_channel)
@@ -3,6 +3,8 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (TitlesViewSet, CategoriesViewSet, GenresViewSet,
                     ReviewsViewSet, CommentsViewSet, UserViewSet,
+                    ReviewsSearchViewSet, CommentsSearchViewSet,
+                    ReviewsFeedViewSet, CommentsFeedViewSet,
                     registration, get_token)
 
 router_v1 = DefaultRouter()
@@ -20,6 +22,22 @@ router_v1.register(
     CommentsViewSet,
     basename='comments'
 )
+router_v1.register(
+    r'search/reviews',
+    ReviewsSearchViewSet,
+    basename='search-reviews'
+)
+router_v1.register(
+    r'search/comments',
+    CommentsSearchViewSet,
+    basename='search-comments'
+)
+router_v1.register(r'reviews', ReviewsFeedViewSet, basename='reviews-feed')
+router_v1.register(
+    r'comments',
+    CommentsFeedViewSet,
+    basename='comments-feed'
+)
 
 auth_urls = [
     path('signup/', registration, name='registration'),
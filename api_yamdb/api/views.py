@@ -1,47 +1,101 @@
 import random
 
-from core.views import CreateListDestroyModelMixinSet
+from core.filters import FullTextSearchFilter, RankedOrderingFilter
+from core.optimization import optimize_queryset
+from core.pagination import (CachedCountPagination,
+                             CursorOrLimitOffsetPagination, KeysetPagination)
+from core.views import (CachedResponseMixin, ConditionalGetMixin,
+                        CreateListDestroyModelMixinSet, OptimizedQuerysetMixin)
 from django.core.mail import send_mail
 from django.db import IntegrityError
-from django.db.models import Avg
+from django.http import Http404
+from django.utils.functional import cached_property
 from django_filters.rest_framework.backends import DjangoFilterBackend
-from rest_framework import filters, generics, viewsets
+from rest_framework import filters, generics, mixins, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import (SAFE_METHODS, AllowAny,
                                         IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.deletion import delete_category, delete_genre, delete_title
+from reviews.models import Category, Comments, Genre, Review, Title, User
+from reviews.moderation import delete_comments, delete_reviews
+from reviews.purge import get_purge_progress, request_user_purge
+from reviews.rankings import get_top_titles
+from reviews.ratings import get_score_distribution
+from reviews.search import COMMENTS_INDEX, REVIEWS_INDEX, TITLES_INDEX
+from reviews.slugs import CATEGORIES, GENRES
 
 from api_yamdb.settings import DEFAULT_FROM_EMAIL
 
-from .filters import TitleFilter
-from .permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrStaffOrReadOnly
-from .serializers import (CategorySerializer, CommentsSerializer,
-                          EditProfileSerializer, GenreSerializer,
-                          ReadTitleSerializer, RegistrationSerializer,
-                          ReviewsSerializer, TokenSerializer, UserSerializer,
+from .filters import CommentFilter, ReviewFilter, TitleFilter
+from .permissions import (IsAdmin, IsAdminOrReadOnly,
+                          IsAuthorOrStaffOrReadOnly, IsModerator)
+from .serializers import (BulkDeleteSerializer, BulkTitleSerializer,
+                          CategorySerializer,
+                          CommentFeedSerializer, CommentSearchSerializer,
+                          CommentsSerializer, EditProfileSerializer,
+                          GenreSerializer, ReadTitleSerializer,
+                          RegistrationSerializer, ReviewFeedSerializer,
+                          ReviewSearchSerializer, ReviewsSerializer,
+                          TokenSerializer, UserSerializer,
                           WriteTitleSerializer)
+from .streams import publish_title_event
 
 OK = 200
+CREATED = 201
 BAD_REQUEST = 400
 METHOD_NOT_ALLOWED = 405
 
+TOP_DEFAULT_SIZE = 10
+TOP_MAX_SIZE = 100
+BULK_MAX_SIZE = 5000
+
 BAD_REQUEST_MESSAGE = ('В базе данных уже есть пользователь '
                        'с таким "username" или "email"')
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet для работы с пользователями."""
 
     lookup_field = 'username'
-    queryset = User.objects.all()
+    queryset = User.objects.filter(deleted_at__isnull=True)
     serializer_class = UserSerializer
-    paginathion_class = (LimitOffsetPagination,)
+    pagination_class = CachedCountPagination
+    version_namespaces = ('users',)
     permission_classes = (IsAdmin,)
 
+    def perform_destroy(self, instance):
+        """Деактивирует пользователя сразу, а его отзывы и комментарии
+        удаляет в фоне.
+
+        Args:
+            instance (User): удаляемый пользователь.
+        """
+
+        request_user_purge(instance)
+
+    @action(methods=['get'], detail=True, url_path='purge')
+    def purge_progress(self, request, username=None):
+        """Выводит ход фонового удаления пользователя.
+
+        Args:
+            request (Request): обьект запроса.
+            username (str): имя пользователя.
+
+        Raises:
+            Http404: удаление пользователя не запрашивалось.
+
+        Returns:
+            Response: объект ответа с состоянием удаления.
+        """
+
+        progress = get_purge_progress(username)
+        if progress is None:
+            raise Http404
+        return Response(progress, status=OK)
+
     @action(
         methods=['get', 'patch'],
         detail=False,
@@ -129,7 +183,10 @@ def get_token(request):
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     user = generics.get_object_or_404(
-        User, username=serializer.validated_data['username'])
+        User,
+        username=serializer.validated_data['username'],
+        deleted_at__isnull=True
+    )
     if (user.confirmation_code
             == serializer.validated_data['confirmation_code']):
         token = RefreshToken.for_user(user)
@@ -138,20 +195,30 @@ def get_token(request):
     return Response(serializer.errors, status=BAD_REQUEST)
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class TitlesViewSet(ConditionalGetMixin, CachedResponseMixin,
+                    OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet для работы с произведениями."""
 
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+    queryset = Title.objects.all()
     permission_classes = (IsAuthenticatedOrReadOnly, IsAdminOrReadOnly)
-    paginathion_class = (LimitOffsetPagination,)
+    pagination_class = CursorOrLimitOffsetPagination
+    version_namespaces = ('titles',)
     filter_backends = (
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter
+        FullTextSearchFilter,
+        RankedOrderingFilter
     )
     filterset_class = TitleFilter
-    search_fields = ('name',)
-    ordering_fields = ('name',)
+    search_index = TITLES_INDEX
+    search_fields = ('name', 'description')
+    ordering_fields = (
+        'name', 'year', 'rating', 'review_count', 'weighted_rating'
+    )
+    # У каждого отзыва есть оценка, поэтому количество отзывов совпадает с
+    # хранимым количеством оценок.
+    ordering_aliases = {'review_count': 'rating_count'}
+    ordering = ('id',)
+    lookup_value_regex = r'\d+'
 
     def get_serializer_class(self):
         """Возвращает класс сериализатора.
@@ -169,12 +236,147 @@ class TitlesViewSet(viewsets.ModelViewSet):
             return ReadTitleSerializer
         return WriteTitleSerializer
 
+    def perform_destroy(self, instance):
+        """Удаляет произведение, удаляя отзывы и комментарии частями без
+        загрузки их в память.
+
+        Args:
+            instance (Title): удаляемое произведение.
+        """
+
+        delete_title(instance)
+
+    @action(
+        methods=['get'],
+        detail=True,
+        url_path='rating-distribution'
+    )
+    def rating_distribution(self, request, pk=None):
+        """Выводит количество отзывов на произведение по каждой оценке.
+
+        Args:
+            request (Request): обьект запроса.
+            pk (str): id произведения.
+
+        Returns:
+            Response: объект ответа со словарем оценка -> количество
+            отзывов.
+
+        Raises:
+            Http404: если произведение не найдено.
+        """
+
+        distribution = get_score_distribution(pk)
+        if distribution is None:
+            raise Http404
+        return Response(distribution, status=OK)
+
+    @action(methods=['get'], detail=False, url_path='top')
+    def top(self, request):
+        """Выводит лучшие произведения по рейтингу, можно указать
+        категорию (category), жанр (genre) и количество (n).
+
+        Args:
+            request (Request): обьект запроса.
+
+        Returns:
+            Response: объект ответа со списком произведений от лучшего к
+            худшему.
+        """
 
-class CategoriesGenresViewSet(CreateListDestroyModelMixinSet):
+        try:
+            size = int(request.query_params.get('n', TOP_DEFAULT_SIZE))
+        except ValueError:
+            return Response(
+                {'n': ['Ожидается целое число.']}, status=BAD_REQUEST
+            )
+        size = min(max(size, 1), TOP_MAX_SIZE)
+        scope = {}
+        for param, slug_map in (('category', CATEGORIES), ('genre', GENRES)):
+            slug = request.query_params.get(param)
+            if slug:
+                scope[f'{param}_id'] = slug_map.get_id(slug)
+                if scope[f'{param}_id'] is None:
+                    return Response([], status=OK)
+        ids = get_top_titles(limit=size, **scope)
+        return Response(self.get_titles_data(ids), status=OK)
+
+    def get_titles_data(self, ids):
+        """Выводит произведения в заданном порядке постоянным числом
+        запросов.
+
+        Args:
+            ids (list): id произведений.
+
+        Returns:
+            ReturnList: данные произведений.
+        """
+
+        serializer = ReadTitleSerializer(
+            context=self.get_serializer_context()
+        )
+        titles = optimize_queryset(
+            Title.objects.all(), serializer
+        ).in_bulk(ids)
+        return ReadTitleSerializer(
+            [titles[pk] for pk in ids if pk in titles],
+            many=True,
+            context=self.get_serializer_context()
+        ).data
+
+    @action(
+        methods=['post', 'patch'],
+        detail=False,
+        url_path='bulk'
+    )
+    def bulk(self, request):
+        """Создает (POST) или изменяет (PATCH) список произведений.
+
+        При изменении у каждого произведения указывается id, остальные поля
+        необязательны.
+
+        Args:
+            request (Request): обьект запроса.
+
+        Returns:
+            Response: объект ответа с созданными или измененными
+            произведениями.
+        """
+
+        data = request.data
+        if isinstance(data, list) and len(data) > BULK_MAX_SIZE:
+            return Response(
+                {'detail': ('За один запрос можно передать не более '
+                            f'{BULK_MAX_SIZE} произведений')},
+                status=BAD_REQUEST
+            )
+        instance = None
+        if request.method == 'PATCH' and isinstance(data, list):
+            instance = Title.objects.in_bulk([
+                item['id'] for item in data
+                if isinstance(item, dict) and isinstance(item.get('id'), int)
+            ])
+        serializer = BulkTitleSerializer(
+            instance,
+            data=data,
+            many=True,
+            partial=instance is not None,
+            context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        titles = serializer.save()
+        return Response(
+            self.get_titles_data([title.pk for title in titles]),
+            status=OK if instance is not None else CREATED
+        )
+
+
+class CategoriesGenresViewSet(ConditionalGetMixin,
+                              CreateListDestroyModelMixinSet):
     """Родительский ViewSet для работы с категориями/жанрами."""
 
     permission_classes = (IsAdminOrReadOnly,)
-    paginathion_class = (LimitOffsetPagination,)
+    pagination_class = CachedCountPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
@@ -188,6 +390,17 @@ class CategoriesViewSet(CategoriesGenresViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    version_namespaces = ('categories',)
+
+    def perform_destroy(self, instance):
+        """Удаляет категорию, убирая ее у произведений частями без загрузки
+        их в память.
+
+        Args:
+            instance (Category): удаляемая категория.
+        """
+
+        delete_category(instance)
 
 
 class GenresViewSet(CategoriesGenresViewSet):
@@ -195,21 +408,39 @@ class GenresViewSet(CategoriesGenresViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    version_namespaces = ('genres',)
+
+    def perform_destroy(self, instance):
+        """Удаляет жанр, убирая его у произведений частями без загрузки их
+        в память.
 
+        Args:
+            instance (Genre): удаляемый жанр.
+        """
 
-class ReviewsViewSet(viewsets.ModelViewSet):
+        delete_genre(instance)
+
+
+class ReviewsViewSet(ConditionalGetMixin, OptimizedQuerysetMixin,
+                     viewsets.ModelViewSet):
     """ViewSet для работы с отзывами."""
 
     serializer_class = ReviewsSerializer
+    pagination_class = CursorOrLimitOffsetPagination
+    version_namespaces = ('reviews', 'reviews:{title_id}')
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrStaffOrReadOnly)
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('name',)
+    filter_backends = (FullTextSearchFilter, RankedOrderingFilter)
+    search_index = REVIEWS_INDEX
+    search_fields = ('text',)
+    ordering_fields = ('pub_date', 'score')
+    ordering = ('-pub_date', '-id')
 
-    def get_title(self, id=None):
-        """Получает обьект текущего произведения.
+    @cached_property
+    def title(self):
+        """Текущее произведение, загружается один раз за запрос.
 
-        Args:
-            id (int, optional): id рецепта. Defaults to None.
+        Raises:
+            Http404: произведение не найдено.
 
         Returns:
             Title: обьект текущего произведения.
@@ -219,6 +450,15 @@ class ReviewsViewSet(viewsets.ModelViewSet):
             Title, id=self.kwargs.get('title_id')
         )
 
+    def get_title(self):
+        """Получает обьект текущего произведения.
+
+        Returns:
+            Title: обьект текущего произведения.
+        """
+
+        return self.title
+
     def get_queryset(self):
         """Получает список отзывов на текущее произведение.
 
@@ -226,11 +466,11 @@ class ReviewsViewSet(viewsets.ModelViewSet):
             QuerySet: список отзывов на текущее произведение.
         """
 
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.order_by(*self.ordering)
 
     def perform_create(self, serializer):
         """При добавлении отзыва привязывает к нему пользователя который его
-        добавляет.
+        добавляет и публикует событие review в канал произведения.
 
         Args:
             serializer (ReviewsSerializer): объект сериализатора для работы с
@@ -241,31 +481,69 @@ class ReviewsViewSet(viewsets.ModelViewSet):
             author=self.request.user,
             title=self.get_title()
         )
+        publish_title_event(self.get_title().id, 'review', serializer.data)
 
+    def perform_destroy(self, instance):
+        """Удаляет отзыв вместе с комментариями без обработки каждого
+        комментария по отдельности.
 
-class CommentsViewSet(viewsets.ModelViewSet):
+        Args:
+            instance (Review): удаляемый отзыв.
+        """
+
+        delete_reviews(Review.objects.filter(pk=instance.pk))
+
+
+class CommentsViewSet(ConditionalGetMixin, OptimizedQuerysetMixin,
+                      viewsets.ModelViewSet):
     """ViewSet для работы с коментариями."""
 
     serializer_class = CommentsSerializer
+    pagination_class = CursorOrLimitOffsetPagination
+    version_namespaces = ('comments', 'comments:{review_id}')
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrStaffOrReadOnly)
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (FullTextSearchFilter, RankedOrderingFilter)
+    search_index = COMMENTS_INDEX
     search_fields = ('text',)
+    ordering_fields = ('pub_date',)
+    ordering = ('-pub_date', '-id')
 
-    def get_review(self):
-        """Получает объект текущего отзыва.
+    @cached_property
+    def review(self):
+        """Текущий отзыв вместе с произведением, загружается одним
+        запросом с JOIN один раз за запрос.
+
+        Raises:
+            Http404: отзыв к текущему произведению не найден.
 
         Returns:
             Review: объект текущего отзыва.
         """
 
         return generics.get_object_or_404(
-            Review,
+            Review.objects.select_related('title'),
             id=self.kwargs.get('review_id'),
-            title=ReviewsViewSet.get_title(
-                self, id=self.kwargs.get('title_id')
-            )
+            title_id=self.kwargs.get('title_id')
         )
 
+    def get_review(self):
+        """Получает объект текущего отзыва.
+
+        Returns:
+            Review: объект текущего отзыва.
+        """
+
+        return self.review
+
+    def get_title(self):
+        """Получает обьект текущего произведения без отдельного запроса.
+
+        Returns:
+            Title: обьект текущего произведения.
+        """
+
+        return self.review.title
+
     def get_queryset(self):
         """Получает список комментариев на текущий отзыв.
 
@@ -273,11 +551,12 @@ class CommentsViewSet(viewsets.ModelViewSet):
             QuerySet: список комментариев на текущий отзыв.
         """
 
-        return self.get_review().comments.all()
+        return self.get_review().comments.order_by(*self.ordering)
 
     def perform_create(self, serializer):
         """При добавлении комментария к отзыву привязывает к нему пользователя
-        который его добавляет.
+        который его добавляет и публикует событие comment в канал
+        произведения.
 
         Args:
             serializer (CommentsSerializer): объект сериализатора для работы с
@@ -288,3 +567,112 @@ class CommentsViewSet(viewsets.ModelViewSet):
             author=self.request.user,
             review=self.get_review()
         )
+        publish_title_event(
+            self.get_title().id,
+            'comment',
+            {**serializer.data, 'review': self.get_review().id}
+        )
+
+
+class ReviewsCommentsSearchViewSet(OptimizedQuerysetMixin,
+                                   mixins.ListModelMixin,
+                                   viewsets.GenericViewSet):
+    """Родительский ViewSet для поиска по всем отзывам/комментариям.
+
+    Attributes:
+        delete_queryset (callable): функция, удаляющая объекты запроса и
+        возвращающая их количество, используется в bulk_delete.
+    """
+
+    permission_classes = (IsModerator,)
+    pagination_class = CursorOrLimitOffsetPagination
+    filter_backends = (
+        DjangoFilterBackend,
+        FullTextSearchFilter,
+        RankedOrderingFilter
+    )
+    search_fields = ('text',)
+    ordering_fields = ('pub_date',)
+    ordering = ('-pub_date', '-id')
+    delete_queryset = None
+
+    class Meta:
+        abstract = True
+
+    @action(methods=['post'], detail=False, url_path='delete')
+    def bulk_delete(self, request):
+        """Удаляет объекты по списку id и/или автору одним запросом.
+
+        Args:
+            request (Request): обьект запроса.
+
+        Returns:
+            Response: объект ответа с количеством удаленных объектов.
+        """
+
+        serializer = BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.get_queryset()
+        if 'ids' in serializer.validated_data:
+            queryset = queryset.filter(pk__in=serializer.validated_data['ids'])
+        if 'author' in serializer.validated_data:
+            queryset = queryset.filter(
+                author__username=serializer.validated_data['author']
+            )
+        return Response(
+            {'deleted': self.delete_queryset(queryset)},
+            status=OK
+        )
+
+
+class ReviewsSearchViewSet(ReviewsCommentsSearchViewSet):
+    """ViewSet для поиска по всем отзывам."""
+
+    queryset = Review.objects.all()
+    serializer_class = ReviewSearchSerializer
+    filterset_class = ReviewFilter
+    search_index = REVIEWS_INDEX
+    delete_queryset = staticmethod(delete_reviews)
+
+
+class CommentsSearchViewSet(ReviewsCommentsSearchViewSet):
+    """ViewSet для поиска по всем комментариям."""
+
+    queryset = Comments.objects.all()
+    serializer_class = CommentSearchSerializer
+    filterset_class = CommentFilter
+    search_index = COMMENTS_INDEX
+    delete_queryset = staticmethod(delete_comments)
+
+
+class FeedViewSet(ConditionalGetMixin, OptimizedQuerysetMixin,
+                  mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Родительский ViewSet для лент последних отзывов/комментариев.
+
+    Выдача идет по индексу pub_date от новых к старым страницами по
+    курсору (pub_date, id), название произведения и имя автора
+    загружаются тем же запросом через JOIN.
+    """
+
+    permission_classes = (AllowAny,)
+    pagination_class = KeysetPagination
+    ordering = ('-pub_date', '-id')
+
+    class Meta:
+        abstract = True
+
+
+class ReviewsFeedViewSet(FeedViewSet):
+    """ViewSet для ленты последних отзывов по всем произведениям."""
+
+    queryset = Review.objects.all()
+    serializer_class = ReviewFeedSerializer
+    version_namespaces = ('titles', 'reviews')
+
+
+class CommentsFeedViewSet(FeedViewSet):
+    """ViewSet для ленты последних комментариев по всем произведениям."""
+
+    queryset = Comments.objects.all()
+    serializer_class = CommentFeedSerializer
+    version_namespaces = ('titles', 'comments', 'comments:feed')
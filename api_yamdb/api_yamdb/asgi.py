@@ -3,14 +3,24 @@ ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+The ASGI application serves long-lived streams such as Server-Sent Events of
+new reviews and comments and runs the rest of the API, which Django 2.2 can
+only handle over WSGI, in a thread pool of the same process. Keeping both in
+one process lets the default in-memory events broker deliver the events.
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+django.setup()
 
-application = get_asgi_application()
+from api.streams import title_events  # noqa: E402
+from core.asgi import Router, WSGIApplication  # noqa: E402
+
+application = Router(
+    [(r'^/api/v1/titles/(?P<title_id>\d+)/events/$', title_events)],
+    default=WSGIApplication(get_wsgi_application()),
+)
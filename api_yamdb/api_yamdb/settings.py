@@ -73,6 +73,20 @@ DATABASES = {
 }
 
 
+# Cache
+# Счетчики версий данных и кешированные ответы должны быть общими для всех
+# процессов, в продакшене здесь нужен общий кеш (Redis, Memcached).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -129,6 +143,34 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Режим подсчета количества объектов в списках: exact, approx или none.
+PAGINATION_COUNT_MODE = 'exact'
+PAGINATION_COUNT_CACHE_TIMEOUT = 60 * 60
+RESPONSE_CACHE_TIMEOUT = 60 * 10
+
+# Бэкенд полнотекстового поиска, для баз данных кроме SQLite подойдет
+# core.search.DatabaseSearchBackend.
+SEARCH_BACKEND = 'core.search.SQLiteFTS5Backend'
+
+# Брокер событий для потоковой выдачи новых отзывов и комментариев (ASGI).
+# core.events.LocalBroker работает в пределах одного процесса.
+EVENTS_BROKER = 'core.events.LocalBroker'
+EVENTS_HEARTBEAT = 15
+
+# Фоновые задачи (удаление пользователей) выполняются в пуле потоков
+# процесса, при BACKGROUND_JOBS_EAGER = True - сразу в текущем потоке.
+BACKGROUND_JOBS_EAGER = False
+BACKGROUND_JOBS_WORKERS = 1
+
+# Минимальное количество оценок для попадания в рейтинг лучших произведений.
+LEADERBOARD_MIN_REVIEWS = 3
+
+# Байесовский рейтинг: оценка произведения сдвигается к RATING_PRIOR_MEAN
+# так, будто у него есть еще RATING_PRIOR_COUNT таких оценок. После
+# изменения настроек рейтинг пересчитывается командой recalcratings.
+RATING_PRIOR_MEAN = 5.5
+RATING_PRIOR_COUNT = 5
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
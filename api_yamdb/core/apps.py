@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from .search import install_indexes
+
+        post_migrate.connect(install_indexes, dispatch_uid='search_install')
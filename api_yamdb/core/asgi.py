@@ -0,0 +1,220 @@
+import asyncio
+import io
+import json
+import re
+import sys
+
+from django.conf import settings
+
+
+async def send_response(send, status, body=b'',
+                        content_type=b'text/plain; charset=utf-8'):
+    """Отправляет простой HTTP ответ целиком.
+
+    Args:
+        send (callable): функция отправки сообщений ASGI.
+        status (int): код ответа.
+        body (bytes, optional): тело ответа.
+        content_type (bytes, optional): значение Content-Type.
+    """
+
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type)],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_error(send, status, detail):
+    """Отправляет ошибку в формате ответов API.
+
+    Args:
+        send (callable): функция отправки сообщений ASGI.
+        status (int): код ответа.
+        detail (str): текст ошибки.
+    """
+
+    await send_response(
+        send,
+        status,
+        json.dumps({'detail': detail}, ensure_ascii=False).encode('utf-8'),
+        b'application/json'
+    )
+
+
+async def lifespan(scope, receive, send):
+    """Отвечает на сообщения запуска и остановки ASGI сервера."""
+
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def read_body(receive):
+    """Читает тело HTTP запроса целиком.
+
+    Args:
+        receive (callable): функция получения сообщений ASGI.
+
+    Returns:
+        bytes: тело запроса либо None, если клиент отключился.
+    """
+
+    body = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body.append(message.get('body', b''))
+        if not message.get('more_body', False):
+            return b''.join(body)
+
+
+def build_environ(scope, body):
+    """Собирает окружение WSGI для запроса ASGI.
+
+    Args:
+        scope (dict): scope запроса ASGI.
+        body (bytes): тело запроса.
+
+    Returns:
+        dict: окружение WSGI.
+    """
+
+    script_name = scope.get('root_path', '')
+    path = scope['path']
+    if script_name and path.startswith(script_name):
+        path = path[len(script_name):]
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin-1')
+        if name in environ:
+            # Заголовки Cookie склеиваются через "; ", остальные через ",".
+            separator = '; ' if name == 'HTTP_COOKIE' else ','
+            value = f'{environ[name]}{separator}{value}'
+        environ[name] = value
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+
+class WSGIApplication(object):
+    """ASGI приложение, выполняющее WSGI приложение в пуле потоков.
+
+    Django 2.2 не умеет обрабатывать запросы по ASGI, поэтому API
+    выполняется в потоках цикла событий, а ответ отправляется целиком после
+    завершения запроса. Так API и потоковая выдача событий работают в одном
+    процессе и используют один брокер событий.
+
+    Attributes:
+        application (callable): приложение WSGI.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        body = await read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+        status, headers, content = await loop.run_in_executor(
+            None, self.run, build_environ(scope, body)
+        )
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers,
+        })
+        await send({'type': 'http.response.body', 'body': content})
+
+    def run(self, environ):
+        """Выполняет запрос WSGI.
+
+        Args:
+            environ (dict): окружение WSGI.
+
+        Returns:
+            tuple: код ответа, заголовки ASGI и тело ответа.
+        """
+
+        response = {}
+        chunks = []
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and 'status' in response:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+            return chunks.append
+
+        result = self.application(environ, start_response)
+        try:
+            chunks.extend(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return response['status'], response['headers'], b''.join(chunks)
+
+
+class Router(object):
+    """ASGI приложение, выбирающее обработчик по пути запроса.
+
+    Attributes:
+        routes (list): пары (регулярное выражение пути, приложение ASGI),
+        именованные группы выражения попадают в scope['url_route'].
+        default (callable): приложение ASGI для остальных путей, без него
+        они отвечают 404.
+    """
+
+    def __init__(self, routes, default=None):
+        self.routes = [
+            (re.compile(pattern), app) for pattern, app in routes
+        ]
+        self.default = default
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await lifespan(scope, receive, send)
+        path = scope['path']
+        prefix = getattr(settings, 'FORCE_SCRIPT_NAME', None) or ''
+        if prefix and path.startswith(prefix):
+            path = path[len(prefix):]
+        for pattern, app in self.routes:
+            match = pattern.match(path)
+            if match:
+                scope = dict(scope, url_route={'kwargs': match.groupdict()})
+                return await app(scope, receive, send)
+        if self.default is not None:
+            return await self.default(scope, receive, send)
+        await send_error(send, 404, 'Страница не найдена.')
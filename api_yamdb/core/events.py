@@ -0,0 +1,161 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_broker = None
+
+
+class Subscription(object):
+    """Подписка на канал событий.
+
+    Сообщения складываются в очередь цикла asyncio, в котором создана
+    подписка, поэтому публиковать их можно из любого потока. Если клиент
+    не успевает читать, сообщения сверх max_size отбрасываются.
+
+    Attributes:
+        broker (BaseBroker): брокер, выдавший подписку.
+        channel (str): название канала.
+    """
+
+    def __init__(self, broker, channel, max_size=100):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_size)
+
+    def put(self, message):
+        """Передает сообщение в очередь подписки.
+
+        Args:
+            message (dict): сообщение.
+
+        Returns:
+            bool: False, если цикл событий подписки уже закрыт.
+        """
+
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            return False
+        return True
+
+    def _put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self):
+        """Ждет следующее сообщение канала.
+
+        Returns:
+            dict: сообщение.
+        """
+
+        return await self.queue.get()
+
+    def close(self):
+        """Отменяет подписку."""
+
+        self.broker.unsubscribe(self)
+
+
+class BaseBroker(ABC):
+    """Интерфейс брокера сообщений для потоковой выдачи событий.
+
+    Брокер для нескольких процессов (например, на Redis pub/sub) должен
+    доставлять опубликованные сообщения в Subscription.put подписок своего
+    процесса.
+    """
+
+    @abstractmethod
+    def publish(self, channel, message):
+        """Публикует сообщение в канал.
+
+        Args:
+            channel (str): название канала.
+            message (dict): сообщение.
+        """
+
+    @abstractmethod
+    def subscribe(self, channel):
+        """Подписывается на канал из цикла событий asyncio.
+
+        Args:
+            channel (str): название канала.
+
+        Returns:
+            Subscription: подписка.
+        """
+
+    @abstractmethod
+    def unsubscribe(self, subscription):
+        """Отменяет подписку.
+
+        Args:
+            subscription (Subscription): подписка.
+        """
+
+
+class LocalBroker(BaseBroker):
+    """Брокер в памяти процесса.
+
+    Подходит для разработки и для запуска в одном процессе, в котором
+    работают и API, и потоковая выдача.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            if not subscription.put(message):
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.channel]
+
+
+def get_broker():
+    """Возвращает брокер из настройки EVENTS_BROKER.
+
+    Брокер создается один раз на процесс: публикации и подписки должны
+    идти через один и тот же объект.
+    """
+
+    global _broker
+    if _broker is None:
+        _broker = import_string(getattr(
+            settings, 'EVENTS_BROKER', 'core.events.LocalBroker'
+        ))()
+    return _broker
+
+
+def publish(channel, event, data):
+    """Публикует событие в канал.
+
+    Args:
+        channel (str): название канала.
+        event (str): тип события.
+        data (dict): данные события.
+    """
+
+    get_broker().publish(channel, {'event': event, 'data': data})
@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class BitmaskField(models.BigIntegerField):
+    """Целое число, хранящее набор флагов в битах.
+
+    Поддерживает фильтры has_all (установлены все биты маски) и has_any
+    (установлен хотя бы один бит маски), которые выполняются в одной
+    таблице без JOIN.
+    """
+
+
+@BitmaskField.register_lookup
+class HasAllBits(models.Lookup):
+    lookup_name = 'has_all'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return (f'({lhs} & {rhs}) = {rhs}',
+                [*lhs_params, *rhs_params, *rhs_params])
+
+
+@BitmaskField.register_lookup
+class HasAnyBits(models.Lookup):
+    lookup_name = 'has_any'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'({lhs} & {rhs}) != 0', [*lhs_params, *rhs_params]
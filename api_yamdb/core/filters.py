@@ -0,0 +1,42 @@
+from rest_framework import filters
+
+from .search import SEARCH_RANK, get_backend
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """Поиск по полнотекстовому индексу представления.
+
+    Индекс задается атрибутом search_index представления, искать можно по
+    полям индекса из search_fields. Без индекса работает как SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, 'search_index', None)
+        terms = ' '.join(self.get_search_terms(request))
+        if index is None or not terms:
+            return super().filter_queryset(request, queryset, view)
+        fields = getattr(view, 'search_fields', None) or index.fields
+        return get_backend().search(queryset, index, terms, fields)
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """Сортировка, которая без параметра ordering ставит выше самые
+    релевантные результаты полнотекстового поиска.
+
+    Атрибут ordering_aliases представления задает другие названия полей
+    сортировки, например {'review_count': 'rating_count'}.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        aliases = getattr(view, 'ordering_aliases', {})
+        if ordering and aliases:
+            ordering = [
+                ('-' if field.startswith('-') else '')
+                + aliases.get(field.lstrip('-'), field.lstrip('-'))
+                for field in ordering
+            ]
+        if (request.query_params.get(self.ordering_param)
+                or SEARCH_RANK not in queryset.query.annotations):
+            return ordering
+        return [SEARCH_RANK, *(ordering or ())]
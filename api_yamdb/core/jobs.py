@@ -0,0 +1,56 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    """Возвращает пул потоков для фоновых задач процесса."""
+
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'BACKGROUND_JOBS_WORKERS', 1),
+            thread_name_prefix='jobs'
+        )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    """Выполняет задачу в потоке пула и закрывает его соединения с базой."""
+
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception('Ошибка фоновой задачи %s', func.__name__)
+        raise
+    finally:
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """Запускает задачу в фоне после фиксации текущей транзакции.
+
+    При BACKGROUND_JOBS_EAGER = True задача выполняется сразу в текущем
+    потоке, это удобно для тестов и management команд. Задачи не
+    переживают перезапуск процесса, поэтому должны уметь продолжать
+    работу при повторном запуске.
+
+    Args:
+        func (callable): задача.
+        *args: позиционные аргументы задачи.
+        **kwargs: именованные аргументы задачи.
+    """
+
+    def submit():
+        if getattr(settings, 'BACKGROUND_JOBS_EAGER', False):
+            func(*args, **kwargs)
+        else:
+            get_executor().submit(_run, func, args, kwargs)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.search import get_backend, get_indexes
+
+
+class Command(BaseCommand):
+    help = 'Create and rebuild full-text search indexes'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        for index in get_indexes():
+            backend.install(index)
+            backend.rebuild(index)
+            self.stdout.write(f'Индекс {index.name} перестроен')
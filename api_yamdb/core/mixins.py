@@ -1,6 +1,7 @@
 import re
 
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
 
 class ValidateMixin(object):
@@ -27,3 +28,44 @@ class ValidateMixin(object):
         if re.match(r'^[\w.@+-]+\Z', username) is None:
             raise serializers.ValidationError(text + username)
         return username
+
+
+def get_query_param_names(request, param):
+    """Возвращает названия из параметра запроса вида a,b&param=c.
+
+    Args:
+        request (Request): обьект запроса.
+        param (str): название параметра.
+
+    Returns:
+        set: названия без пробелов и пустых значений.
+    """
+
+    names = set()
+    for value in request.query_params.getlist(param):
+        names.update(name.strip() for name in value.split(','))
+    names.discard('')
+    return names
+
+
+class SparseFieldsMixin(object):
+    """Класс примесь, оставляющий в выводе поля из параметров запроса.
+
+    Параметр fields перечисляет выводимые поля, omit - исключаемые. Поля
+    удаляются из сериализатора, поэтому OptimizedQuerysetMixin не загружает
+    для них связи и столбцы. Учитывается только при чтении данных.
+    """
+
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        fields = get_query_param_names(request, self.fields_query_param)
+        omit = get_query_param_names(request, self.omit_query_param)
+        for name in list(self.fields):
+            if (fields and name not in fields) or name in omit:
+                self.fields.pop(name)
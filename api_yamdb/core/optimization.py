@@ -0,0 +1,199 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import relations, serializers
+
+_required_fields = {}
+
+
+def require_fields(model, *fields):
+    """Запрещает откладывать загрузку полей модели.
+
+    Нужно для полей, которые читаются у каждого загруженного объекта,
+    например в обработчиках post_init.
+
+    Args:
+        model (Model): модель.
+        *fields (str): названия полей.
+    """
+
+    _required_fields.setdefault(model, set()).update(fields)
+
+
+def _relation_kind(model, source_attrs):
+    """Определяет тип связи по пути из атрибутов модели.
+
+    Args:
+        model (Model): модель, от которой начинается путь.
+        source_attrs (list): атрибуты поля сериализатора.
+
+    Returns:
+        tuple: ('select' | 'prefetch', модель на конце пути) или None если
+        путь не является связью между моделями.
+    """
+
+    kind = 'select'
+    for attr in source_attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not field.is_relation or field.related_model is None:
+            return None
+        if field.many_to_many or field.one_to_many:
+            kind = 'prefetch'
+        model = field.related_model
+    return kind, model
+
+
+def _related_output(field):
+    """Возвращает вложенный сериализатор или связанное поле из поля.
+
+    Args:
+        field (Field): поле сериализатора.
+
+    Returns:
+        Field: вложенный сериализатор или связанное поле, иначе None.
+    """
+
+    if field.write_only or field.source == '*':
+        return None
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    elif isinstance(field, relations.ManyRelatedField):
+        field = field.child_relation
+    if isinstance(field, relations.RelatedField):
+        return field
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+def _related_source_attrs(field, nested):
+    """Возвращает путь до связанного объекта, который читает поле.
+
+    Args:
+        field (Field): поле сериализатора.
+        nested (Field): результат _related_output для поля.
+
+    Returns:
+        list: атрибуты пути, пустой список если связи загружать не нужно.
+    """
+
+    if nested is None:
+        # Обычное поле с источником вида 'title.name' читает атрибут
+        # связанного объекта.
+        if field.write_only or field.source == '*':
+            return []
+        return field.source_attrs[:-1]
+    if (isinstance(field, relations.RelatedField)
+            and field.use_pk_only_optimization()):
+        # Первичный ключ берется из поля *_id последнего объекта в
+        # пути, загружать нужно только промежуточные объекты. Для
+        # ManyRelatedField это не так, он всегда читает связь.
+        return field.source_attrs[:-1]
+    return field.source_attrs
+
+
+def collect_related_lookups(serializer, model=None, prefix=''):
+    """Собирает связи, которые понадобятся сериализатору при выводе.
+
+    Вложенные сериализаторы и связанные поля превращаются в пути для
+    select_related, если связь ведет к одному объекту, либо для
+    prefetch_related, если к нескольким. Для полей, выводящих только
+    первичный ключ, загружаются лишь промежуточные объекты, для обычных
+    полей с источником через точку - объекты на пути до атрибута.
+
+    Args:
+        serializer (Serializer): объект сериализатора.
+        model (Model, optional): модель сериализатора. Defaults to None,
+        тогда берется из Meta сериализатора.
+        prefix (str, optional): путь до модели сериализатора.
+
+    Returns:
+        tuple: списки путей для select_related и prefetch_related.
+    """
+
+    if model is None:
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return [], []
+    select, prefetch = [], []
+    for field in serializer.fields.values():
+        nested = _related_output(field)
+        source_attrs = _related_source_attrs(field, nested)
+        if not source_attrs:
+            continue
+        relation = _relation_kind(model, source_attrs)
+        if relation is None:
+            continue
+        kind, related_model = relation
+        path = prefix + '__'.join(source_attrs)
+        (select if kind == 'select' else prefetch).append(path)
+        if isinstance(nested, serializers.BaseSerializer):
+            nested_select, nested_prefetch = collect_related_lookups(
+                nested, related_model, path + '__'
+            )
+            if kind == 'select':
+                select.extend(nested_select)
+            else:
+                prefetch.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+    return select, prefetch
+
+
+def collect_deferred_fields(serializer, queryset):
+    """Собирает столбцы модели, которые не нужны для вывода.
+
+    Откладываются только поля без связей, которые не выводит сериализатор,
+    не участвуют в сортировке и не запрещены через require_fields.
+
+    Args:
+        serializer (Serializer): объект сериализатора.
+        queryset (QuerySet): запрос.
+
+    Returns:
+        list: названия полей для defer().
+    """
+
+    model = queryset.model
+    used = set(_required_fields.get(model, ()))
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            return []
+        used.add(field.source_attrs[0])
+    for ordering in (*queryset.query.order_by, *model._meta.ordering):
+        if isinstance(ordering, str):
+            used.add(ordering.lstrip('-').split('__')[0])
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.is_relation and not field.primary_key
+        and field.name not in used
+    ]
+
+
+def optimize_queryset(queryset, serializer, defer=False):
+    """Добавляет в запрос JOIN и предзагрузку связей, нужных сериализатору.
+
+    Args:
+        queryset (QuerySet): исходный запрос.
+        serializer (Serializer): объект сериализатора для вывода данных.
+        defer (bool, optional): откладывать ли загрузку столбцов, которые
+        сериализатор не выводит. Defaults to False.
+
+    Returns:
+        QuerySet: запрос без дополнительных запросов на каждый объект.
+    """
+
+    select, prefetch = collect_related_lookups(
+        serializer, queryset.model
+    )
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if defer:
+        deferred = collect_deferred_fields(serializer, queryset)
+        if deferred:
+            queryset = queryset.defer(*deferred)
+    return queryset
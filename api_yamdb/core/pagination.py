@@ -0,0 +1,384 @@
+import datetime
+import hashlib
+import json
+from base64 import b64decode, b64encode
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, Cursor,
+                                       CursorPagination,
+                                       LimitOffsetPagination,
+                                       _reverse_ordering)
+from rest_framework.utils.urls import replace_query_param
+
+from .versions import get_version, get_view_namespaces
+
+COUNT_EXACT = 'exact'
+COUNT_APPROXIMATE = 'approx'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_APPROXIMATE, COUNT_NONE)
+
+
+class CachedCountPagination(LimitOffsetPagination):
+    """Пагинация по limit/offset с кешированием общего количества объектов.
+
+    Количество кешируется для каждого набора параметров фильтрации и
+    сбрасывается при изменении счетчиков версий представления (атрибут
+    version_namespaces). Параметр count управляет подсчетом:
+        exact - точное количество (из кеша, если данные не менялись);
+        approx - последнее закешированное количество, даже устаревшее;
+        none - количество не считается и не выводится.
+    """
+
+    count_query_param = 'count'
+    ignored_query_params = ('limit', 'offset', 'cursor', 'count',
+                            'ordering', 'format', 'fields', 'omit')
+
+    def get_count_mode(self, request):
+        """Возвращает режим подсчета из запроса либо из настроек.
+
+        Args:
+            request (Request): обьект запроса.
+
+        Returns:
+            str: одно из значений COUNT_MODES.
+        """
+
+        mode = request.query_params.get(self.count_query_param)
+        if mode in COUNT_MODES:
+            return mode
+        return getattr(settings, 'PAGINATION_COUNT_MODE', COUNT_EXACT)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        self.count_mode = self.get_count_mode(request)
+        if self.count_mode != COUNT_NONE:
+            return super().paginate_queryset(queryset, request, view)
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        page = list(queryset[self.offset:self.offset + self.limit + 1])
+        has_next = len(page) > self.limit
+        page = page[:self.limit]
+        # Без COUNT(*) наличие следующей страницы определяется по лишнему
+        # объекту, count нужен только для построения ссылок.
+        self.count = self.offset + len(page) + has_next
+        return page
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count_mode == COUNT_NONE:
+            del response.data['count']
+        return response
+
+    def get_count_cache_key(self):
+        """Возвращает ключ кеша для текущего набора фильтров.
+
+        Returns:
+            str: ключ кеша либо None, если у представления нет счетчиков
+            версий.
+        """
+
+        namespaces = get_view_namespaces(self.view)
+        if not namespaces:
+            return None
+        params = sorted(
+            (key, sorted(values))
+            for key, values in self.request.query_params.lists()
+            if key not in self.ignored_query_params
+        )
+        digest = hashlib.md5(
+            repr((namespaces, params)).encode('utf-8')
+        ).hexdigest()
+        return f'count:{getattr(self.view, "basename", "")}:{digest}'
+
+    def get_count(self, queryset):
+        """Возвращает количество объектов, по возможности из кеша.
+
+        Args:
+            queryset (QuerySet): отфильтрованный запрос.
+
+        Returns:
+            int: количество объектов.
+        """
+
+        key = self.get_count_cache_key()
+        if key is None:
+            return super().get_count(queryset)
+        version = get_version(*get_view_namespaces(self.view))
+        cached = cache.get(key)
+        if cached is not None:
+            cached_version, count = cached
+            if (cached_version == version
+                    or self.count_mode == COUNT_APPROXIMATE):
+                return count
+        count = super().get_count(queryset)
+        cache.set(
+            key,
+            (version, count),
+            getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60 * 60)
+        )
+        return count
+
+
+class KeysetPagination(CursorPagination):
+    """Пагинация по курсору (keyset) без OFFSET и COUNT(*).
+
+    Порядок берется из OrderingFilter представления либо из его атрибута
+    ordering и всегда дополняется первичным ключом, чтобы порядок был
+    однозначным. Курсор хранит значения всех полей сортировки последнего
+    объекта страницы, следующая страница выбирается сравнением строк
+    (f1, ..., id) > (v1, ..., v_id), поэтому стоимость любой страницы не
+    зависит от ее номера и количества одинаковых значений.
+    """
+
+    page_size_query_param = 'limit'
+
+    def get_ordering(self, request, queryset, view):
+        """Возвращает порядок выдачи с первичным ключом в конце.
+
+        Args:
+            request (Request): обьект запроса.
+            queryset (QuerySet): запрос.
+            view (APIView): текущее представление.
+
+        Returns:
+            tuple: поля для order_by.
+        """
+
+        self.ordering = getattr(view, 'ordering', None) or ('-pk',)
+        ordering = super().get_ordering(request, queryset, view)
+        if not {'pk', '-pk', 'id', '-id'} & set(ordering):
+            tie_breaker = '-pk' if ordering[0].startswith('-') else 'pk'
+            ordering += (tie_breaker,)
+        return ordering
+
+    def decode_cursor(self, request):
+        """Возвращает курсор из запроса.
+
+        Args:
+            request (Request): обьект запроса.
+
+        Raises:
+            NotFound: курсор поврежден.
+
+        Returns:
+            Cursor: курсор либо None для первой страницы.
+        """
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            tokens = json.loads(b64decode(encoded.encode('ascii')))
+            position = tokens.get('p')
+            if position is not None and not isinstance(position, list):
+                raise ValueError('position')
+            reverse = bool(tokens.get('r'))
+        except (AttributeError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {}
+        if cursor.reverse:
+            tokens['r'] = 1
+        if cursor.position is not None:
+            tokens['p'] = cursor.position
+        encoded = b64encode(json.dumps(tokens).encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            value = getattr(instance, field.lstrip('-'))
+            if isinstance(value, (datetime.date, datetime.time)):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            position.append(value)
+        return position
+
+    def clean_position(self, queryset, ordering, position):
+        """Приводит значения курсора к типам полей сортировки.
+
+        Args:
+            queryset (QuerySet): запрос.
+            ordering (tuple): поля сортировки текущего запроса.
+            position (list): значения полей из курсора.
+
+        Raises:
+            NotFound: количество или значения полей не подходят к порядку
+            сортировки.
+
+        Returns:
+            list: значения полей.
+        """
+
+        if len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        meta = queryset.model._meta
+        annotations = queryset.query.annotations
+        values = []
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            if name == 'pk':
+                model_field = meta.pk
+            elif name in annotations:
+                model_field = annotations[name].output_field
+            else:
+                model_field = meta.get_field(name)
+            try:
+                if value is not None:
+                    value = model_field.to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    def get_position_filter(self, ordering, position):
+        """Строит условие "после позиции" для порядка сортировки.
+
+        Сравнение строк раскрывается в (f1 > v1) OR (f1 = v1 AND f2 > v2)
+        OR ..., для полей по убыванию знак сравнения меняется. NULL
+        учитывается там, где его ставит база данных: в SQLite и MySQL он
+        меньше любого значения, в PostgreSQL и Oracle - больше.
+
+        Args:
+            ordering (tuple): поля сортировки текущего запроса.
+            position (list): значения полей последнего объекта.
+
+        Returns:
+            Q: условие для filter().
+        """
+
+        nulls_largest = connection.features.nulls_order_largest
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            descending = field.startswith('-')
+            # NULL идет в конце выдачи, если направление сортировки не
+            # совпадает с его местом среди значений.
+            nulls_at_end = descending != nulls_largest
+            if value is None:
+                if not nulls_at_end:
+                    condition |= equal & Q(**{f'{name}__isnull': False})
+                equal &= Q(**{f'{name}__isnull': True})
+                continue
+            after = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+            if nulls_at_end:
+                after |= Q(**{f'{name}__isnull': True})
+            condition |= equal & after
+            equal &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor and self.cursor.position
+        ordering = self.ordering
+        if reverse:
+            ordering = _reverse_ordering(ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            position = self.clean_position(queryset, ordering, position)
+            queryset = queryset.filter(
+                self.get_position_filter(ordering, position)
+            )
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # Пустая страница при обратном проходе: следующей будет первая.
+        position = None
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        # Пустая страница при прямом проходе: предыдущей будет последняя.
+        position = None
+        if self.page:
+            position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=position)
+        )
+
+
+class CursorOrLimitOffsetPagination(BasePagination):
+    """Пагинация по limit/offset либо по курсору, на выбор клиента.
+
+    Если в запросе есть параметр cursor (в том числе пустой, для первой
+    страницы), используется KeysetPagination, иначе CachedCountPagination.
+    """
+
+    cursor_query_param = KeysetPagination.cursor_query_param
+
+    def __init__(self):
+        self.paginator = CachedCountPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выбирает способ пагинации и возвращает страницу.
+
+        Args:
+            queryset (QuerySet): запрос.
+            request (Request): обьект запроса.
+            view (APIView, optional): текущее представление.
+
+        Returns:
+            list: объекты текущей страницы.
+        """
+
+        if self.cursor_query_param in request.query_params:
+            self.paginator = KeysetPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
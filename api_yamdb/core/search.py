@@ -0,0 +1,254 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+SEARCH_RANK = 'search_rank'
+
+_indexes = {}
+
+
+class SearchIndex(object):
+    """Описание полнотекстового индекса по текстовым полям модели.
+
+    Attributes:
+        name (str): название индекса.
+        model (Model): модель.
+        fields (tuple): индексируемые текстовые поля.
+    """
+
+    def __init__(self, name, model, fields):
+        self.name = name
+        self.model = model
+        self.fields = tuple(fields)
+
+    @property
+    def table(self):
+        """Название таблицы индекса."""
+
+        return f'search_{self.name}'
+
+
+def register(index):
+    """Регистрирует индекс, чтобы бэкенд создавал его после миграций.
+
+    Args:
+        index (SearchIndex): описание индекса.
+
+    Returns:
+        SearchIndex: тот же индекс.
+    """
+
+    _indexes[index.name] = index
+    return index
+
+
+def get_indexes():
+    """Возвращает все зарегистрированные индексы."""
+
+    return list(_indexes.values())
+
+
+def get_terms(query):
+    """Разбивает строку поиска на слова.
+
+    Args:
+        query (str): строка поиска.
+
+    Returns:
+        list: слова из строки поиска.
+    """
+
+    return re.findall(r'\w+', query or '')
+
+
+class DatabaseSearchBackend(object):
+    """Поиск через icontains, без отдельного индекса.
+
+    Используется для баз данных без поддержки FTS5 и как образец
+    интерфейса бэкенда поиска.
+    """
+
+    def install(self, index):
+        """Создает индекс в базе данных, если его еще нет."""
+
+    def rebuild(self, index):
+        """Полностью перестраивает индекс по данным модели."""
+
+    def filter(self, queryset, index, query, fields=None):
+        """Оставляет в запросе объекты, содержащие все слова из строки.
+
+        Args:
+            queryset (QuerySet): запрос.
+            index (SearchIndex): индекс.
+            query (str): строка поиска.
+            fields (tuple, optional): поля для поиска, по умолчанию все
+            поля индекса.
+
+        Returns:
+            QuerySet: отфильтрованный запрос.
+        """
+
+        for term in get_terms(query):
+            condition = Q()
+            for field in fields or index.fields:
+                condition |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def search(self, queryset, index, query, fields=None):
+        """Фильтрует запрос и добавляет в него релевантность search_rank.
+
+        Меньшее значение search_rank означает более релевантный объект.
+
+        Args:
+            queryset (QuerySet): запрос.
+            index (SearchIndex): индекс.
+            query (str): строка поиска.
+            fields (tuple, optional): поля для поиска.
+
+        Returns:
+            QuerySet: отфильтрованный запрос с релевантностью.
+        """
+
+        return self.filter(queryset, index, query, fields).annotate(
+            **{SEARCH_RANK: Value(0, output_field=FloatField())}
+        )
+
+
+class SQLiteFTS5Backend(DatabaseSearchBackend):
+    """Поиск по индексу SQLite FTS5.
+
+    Индекс хранится во внешней (external content) виртуальной таблице и
+    обновляется триггерами, поэтому остается актуальным и при bulk_create,
+    update() и каскадном удалении. Слова ищутся по префиксу без учета
+    регистра, в том числе для кириллицы. Для других баз данных
+    используется поиск через icontains.
+    """
+
+    tokenizer = 'unicode61 remove_diacritics 2'
+
+    def is_supported(self):
+        return connection.vendor == 'sqlite'
+
+    def install(self, index):
+        if not self.is_supported():
+            return
+        table = index.table
+        content = index.model._meta.db_table
+        pk = index.model._meta.pk.column
+        columns = [
+            index.model._meta.get_field(field).column
+            for field in index.fields
+        ]
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        insert = (f'INSERT INTO {table}(rowid, {names}) '
+                  f'VALUES (new.{pk}, {new_values});')
+        delete = (f"INSERT INTO {table}({table}, rowid, {names}) "
+                  f"VALUES ('delete', old.{pk}, {old_values});")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                "AND name = %s", [table]
+            )
+            exists = cursor.fetchone() is not None
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                f"{names}, content='{content}', content_rowid='{pk}', "
+                f"tokenize='{self.tokenizer}')"
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT '
+                f'ON {content} BEGIN {insert} END'
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE '
+                f'ON {content} BEGIN {delete} END'
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE '
+                f'OF {names} ON {content} BEGIN {delete} {insert} END'
+            )
+        if not exists:
+            self.rebuild(index)
+
+    def rebuild(self, index):
+        if not self.is_supported():
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {index.table}({index.table}) VALUES ('rebuild')"
+            )
+
+    def get_match(self, index, query, fields=None):
+        """Строит выражение MATCH из строки поиска.
+
+        Args:
+            index (SearchIndex): индекс.
+            query (str): строка поиска.
+            fields (tuple, optional): поля для поиска.
+
+        Returns:
+            str: выражение для MATCH либо None, если в строке нет слов.
+        """
+
+        terms = get_terms(query)
+        if not terms:
+            return None
+        columns = ' '.join(
+            index.model._meta.get_field(field).column
+            for field in fields or index.fields
+        )
+        return ' AND '.join(
+            '{%s} : "%s"*' % (columns, term) for term in terms
+        )
+
+    def filter(self, queryset, index, query, fields=None):
+        if not self.is_supported():
+            return super().filter(queryset, index, query, fields)
+        match = self.get_match(index, query, fields)
+        if match is None:
+            return queryset
+        meta = index.model._meta
+        return queryset.extra(
+            where=[f'{meta.db_table}.{meta.pk.column} IN (SELECT rowid '
+                   f'FROM {index.table} WHERE {index.table} MATCH %s)'],
+            params=[match]
+        )
+
+    def search(self, queryset, index, query, fields=None):
+        if not self.is_supported():
+            return super().search(queryset, index, query, fields)
+        match = self.get_match(index, query, fields)
+        if match is None:
+            return queryset
+        meta = index.model._meta
+        return queryset.extra(
+            tables=[index.table],
+            where=[f'{index.table}.rowid = {meta.db_table}.{meta.pk.column}',
+                   f'{index.table} MATCH %s'],
+            params=[match]
+        ).annotate(**{SEARCH_RANK: RawSQL(
+            f'{index.table}.rank', (), output_field=FloatField()
+        )})
+
+
+def get_backend():
+    """Возвращает бэкенд поиска из настройки SEARCH_BACKEND."""
+
+    return import_string(getattr(
+        settings, 'SEARCH_BACKEND', 'core.search.DatabaseSearchBackend'
+    ))()
+
+
+def install_indexes(**kwargs):
+    """Создает зарегистрированные индексы после применения миграций."""
+
+    backend = get_backend()
+    for index in get_indexes():
+        backend.install(index)
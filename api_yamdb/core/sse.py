@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .asgi import send_error
+from .events import get_broker
+
+
+def format_event(message):
+    """Переводит сообщение брокера в формат Server-Sent Events.
+
+    Args:
+        message (dict): сообщение с ключами event и data.
+
+    Returns:
+        bytes: событие, завершенное пустой строкой.
+    """
+
+    data = json.dumps(message['data'], cls=JSONEncoder, ensure_ascii=False)
+    return f'event: {message["event"]}\ndata: {data}\n\n'.encode('utf-8')
+
+
+async def wait_disconnect(receive):
+    """Ждет отключения клиента."""
+
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+class EventStream(object):
+    """ASGI приложение, отдающее сообщения канала как Server-Sent Events.
+
+    Соединение остается открытым, пока клиент не отключится. Если событий
+    долго нет, отправляется комментарий, чтобы прокси не закрыли
+    соединение по таймауту.
+
+    Attributes:
+        get_channel (callable): корутина, получающая scope и возвращающая
+        название канала либо None, если канала нет (ответ 404).
+        heartbeat (float): секунды между комментариями без событий.
+    """
+
+    def __init__(self, get_channel, heartbeat=None):
+        self.get_channel = get_channel
+        if heartbeat is None:
+            heartbeat = getattr(settings, 'EVENTS_HEARTBEAT', 15)
+        self.heartbeat = heartbeat
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        if scope['method'] != 'GET':
+            return await send_error(
+                send, 405, f'Метод "{scope["method"]}" не разрешен.'
+            )
+        channel = await self.get_channel(scope)
+        if channel is None:
+            return await send_error(send, 404, 'Страница не найдена.')
+        subscription = get_broker().subscribe(channel)
+        disconnect = asyncio.ensure_future(wait_disconnect(receive))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream; charset=utf-8'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            await self.send_body(send, b': connected\n\n')
+            await self.stream(subscription, disconnect, send)
+        finally:
+            subscription.close()
+            disconnect.cancel()
+
+    async def send_body(self, send, body):
+        await send({
+            'type': 'http.response.body',
+            'body': body,
+            'more_body': True,
+        })
+
+    async def stream(self, subscription, disconnect, send):
+        """Отправляет события, пока клиент не отключится.
+
+        Args:
+            subscription (Subscription): подписка на канал.
+            disconnect (Future): задача, ожидающая отключения клиента.
+            send (callable): функция отправки сообщений ASGI.
+        """
+
+        while True:
+            message = asyncio.ensure_future(subscription.get())
+            done, pending = await asyncio.wait(
+                {message, disconnect},
+                timeout=self.heartbeat,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if message not in done:
+                message.cancel()
+            if disconnect in done:
+                return
+            if message in done:
+                await self.send_body(send, format_event(message.result()))
+            else:
+                await self.send_body(send, b': ping\n\n')
@@ -0,0 +1,123 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'version:{}'
+MODIFIED_KEY = 'modified:{}'
+
+
+def _initial_version():
+    """Начальное значение счетчика - текущее время в миллисекундах.
+
+    Если счетчик пропал из кеша, новое значение не совпадет с прежними,
+    поэтому закешированные по старым версиям данные не будут выданы.
+    """
+
+    return int(time.time() * 1000)
+
+
+def get_versions(*namespaces):
+    """Возвращает текущие значения счетчиков версий.
+
+    Args:
+        *namespaces (str): названия счетчиков, например 'titles' или
+        'reviews:1'.
+
+    Returns:
+        list: значения счетчиков в том же порядке.
+    """
+
+    keys = [VERSION_KEY.format(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_version(*namespaces):
+    """Возвращает общую версию для нескольких счетчиков.
+
+    Args:
+        *namespaces (str): названия счетчиков.
+
+    Returns:
+        str: версия вида '<n1>.<n2>...'.
+    """
+
+    return '.'.join(str(version) for version in get_versions(*namespaces))
+
+
+def _increment_versions(namespaces):
+    """Увеличивает счетчики версий и запоминает время изменения."""
+
+    for namespace in namespaces:
+        key = VERSION_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), timeout=None)
+    now = int(time.time())
+    cache.set_many(
+        {MODIFIED_KEY.format(namespace): now for namespace in namespaces},
+        timeout=None
+    )
+
+
+def bump_version(*namespaces):
+    """Увеличивает счетчики версий после изменения данных.
+
+    Внутри транзакции счетчики увеличиваются только после ее фиксации,
+    иначе параллельный запрос мог бы прочитать еще не зафиксированные
+    данные и закешировать их под новой версией. При откате транзакции
+    счетчики не меняются.
+
+    Args:
+        *namespaces (str): названия счетчиков.
+    """
+
+    transaction.on_commit(lambda: _increment_versions(namespaces))
+
+
+def get_last_modified(*namespaces):
+    """Возвращает время последнего изменения данных счетчиков.
+
+    Если время изменения неизвестно (например, кеш очищен), им считается
+    текущий момент, чтобы клиенты не получили устаревшие данные.
+
+    Args:
+        *namespaces (str): названия счетчиков.
+
+    Returns:
+        int: время последнего изменения в секундах от начала эпохи.
+    """
+
+    keys = [MODIFIED_KEY.format(namespace) for namespace in namespaces]
+    modified = cache.get_many(keys)
+    for key in keys:
+        if key not in modified:
+            cache.add(key, int(time.time()), timeout=None)
+            modified[key] = cache.get(key)
+    return max(modified.values())
+
+
+def get_view_namespaces(view):
+    """Возвращает счетчики версий, от которых зависит выдача представления.
+
+    Представление объявляет их в атрибуте version_namespaces, в названиях
+    можно использовать именованные параметры из url, например
+    'reviews:{title_id}'.
+
+    Args:
+        view (APIView): представление.
+
+    Returns:
+        tuple: названия счетчиков, пустой если представление их не объявило.
+    """
+
+    return tuple(
+        namespace.format(**view.kwargs)
+        for namespace in getattr(view, 'version_namespaces', ())
+    )
@@ -1,4 +1,42 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework import viewsets, mixins
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .optimization import optimize_queryset
+from .versions import get_last_modified, get_version, get_view_namespaces
+
+
+def get_request_digest(view, request, ignored_params=()):
+    """Возвращает хеш запроса к представлению.
+
+    Учитываются хост, действие, именованные параметры из url и
+    нормализованные параметры запроса, кроме ignored_params.
+
+    Args:
+        view (APIView): представление.
+        request (Request): обьект запроса.
+        ignored_params (tuple, optional): параметры, которые не влияют на
+        ответ.
+
+    Returns:
+        str: md5 хеш запроса.
+    """
+
+    params = sorted(
+        (key, sorted(values))
+        for key, values in request.query_params.lists()
+        if key not in ignored_params
+    )
+    return hashlib.md5(repr((
+        request.get_host(), view.action, sorted(view.kwargs.items()),
+        params
+    )).encode('utf-8')).hexdigest()
 
 
 class CreateListDestroyModelMixinSet(mixins.CreateModelMixin,
@@ -8,3 +46,160 @@ class CreateListDestroyModelMixinSet(mixins.CreateModelMixin,
     """Класс примесь для создания, вывода списка, удаления объектов"""
 
     pass
+
+
+class OptimizedQuerysetMixin(object):
+    """Класс примесь, подгружающий связи, которые выводит сериализатор.
+
+    Применяется после фильтрации, поэтому работает и для представлений
+    с собственным get_queryset. При чтении данных столбцы, которые
+    сериализатор не выводит, не загружаются.
+    """
+
+    def filter_queryset(self, queryset):
+        """Фильтрует запрос и добавляет в него select/prefetch_related.
+
+        Args:
+            queryset (QuerySet): исходный запрос.
+
+        Returns:
+            QuerySet: отфильтрованный запрос с подгрузкой связей.
+        """
+
+        return optimize_queryset(
+            super().filter_queryset(queryset),
+            self.get_serializer(),
+            defer=self.request.method in SAFE_METHODS
+        )
+
+
+class CachedResponseMixin(object):
+    """Класс примесь, кеширующий ответы на получение списка и объекта.
+
+    Ключ кеша строится из нормализованных параметров запроса и версии
+    счетчиков представления (атрибут version_namespaces), поэтому ответы
+    выдаются из кеша, пока связанные данные не изменятся.
+    """
+
+    ignored_cache_params = ('format',)
+
+    def get_response_cache_key(self, request):
+        """Возвращает ключ кеша для текущего запроса.
+
+        Args:
+            request (Request): обьект запроса.
+
+        Returns:
+            str: ключ кеша либо None, если у представления нет счетчиков
+            версий.
+        """
+
+        namespaces = get_view_namespaces(self)
+        if not namespaces:
+            return None
+        digest = get_request_digest(self, request, self.ignored_cache_params)
+        return (f'response:{self.basename}:{digest}:'
+                f'{get_version(*namespaces)}')
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Возвращает ответ из кеша либо вызывает обработчик и кеширует.
+
+        Args:
+            handler (callable): обработчик запроса.
+            request (Request): обьект запроса.
+
+        Returns:
+            Response: объект ответа.
+        """
+
+        key = self.get_response_cache_key(request)
+        if key is None:
+            return handler(request, *args, **kwargs)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                key,
+                response.data,
+                getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 10)
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class NotModified(Exception):
+    """Прерывает обработку запроса готовым ответом 304 или 412."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin(object):
+    """Класс примесь, отвечающий 304 на условные GET запросы.
+
+    ETag и Last-Modified вычисляются по счетчикам версий представления
+    (атрибут version_namespaces), а не по телу ответа. Проверка идет после
+    аутентификации и проверки прав, но до вызова обработчика, поэтому
+    ответ 304 выдается без запросов к базе данных.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+
+    def get_etag(self, request):
+        """Возвращает сильный ETag для текущего запроса.
+
+        Args:
+            request (Request): обьект запроса.
+
+        Returns:
+            str: ETag в кавычках.
+        """
+
+        digest = hashlib.md5(repr((
+            self.basename,
+            get_request_digest(self, request),
+            request.accepted_renderer.format,
+            get_version(*get_view_namespaces(self))
+        )).encode('utf-8')).hexdigest()
+        return f'"{digest}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = self.last_modified = None
+        namespaces = get_view_namespaces(self)
+        if (request.method not in ('GET', 'HEAD')
+                or self.action not in self.conditional_actions
+                or not namespaces):
+            return
+        self.etag = self.get_etag(request)
+        self.last_modified = get_last_modified(*namespaces)
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (getattr(self, 'etag', None) is not None
+                and response.status_code in (200, 304)):
+            response['ETag'] = self.etag
+            response['Last-Modified'] = http_date(self.last_modified)
+        return response
@@ -0,0 +1,112 @@
+from core.versions import bump_version
+from django.db import connection, transaction
+
+from .genres import get_genre_mask
+from .models import Title, TitlesGenres
+from .rankings import rebuild_rankings
+
+
+def _set_title_ids(titles):
+    """Проставляет id произведениям после bulk_create.
+
+    Если база данных не возвращает id вставленных строк (SQLite в Django
+    2.2), берутся последние id таблицы: внутри транзакции после вставки
+    другие записи в таблицу не попадут, пока она не завершится.
+
+    Args:
+        titles (list): только что вставленные произведения.
+    """
+
+    if not titles or titles[0].pk is not None:
+        return
+    ids = Title.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    )[:len(titles)]
+    for title, pk in zip(titles, reversed(list(ids))):
+        title.pk = pk
+
+
+def _create_title_genres(genres):
+    """Вставляет связи произведений с жанрами одним запросом.
+
+    Args:
+        genres (dict): id произведения -> список жанров.
+    """
+
+    TitlesGenres.objects.bulk_create(
+        TitlesGenres(title_id=title_id, genre=genre)
+        for title_id, title_genres in genres.items()
+        for genre in dict.fromkeys(title_genres)
+    )
+
+
+def bulk_create_titles(items):
+    """Создает произведения пакетно в одной транзакции.
+
+    Args:
+        items (list): словари с полями произведения, genre - список
+        объектов жанров.
+
+    Returns:
+        list: созданные произведения.
+    """
+
+    titles = [
+        Title(
+            genre_mask=get_genre_mask(item.get('genre', ())),
+            **{key: value for key, value in item.items() if key != 'genre'}
+        )
+        for item in items
+    ]
+    with transaction.atomic():
+        Title.objects.bulk_create(titles)
+        if not connection.features.can_return_ids_from_bulk_insert:
+            _set_title_ids(titles)
+        _create_title_genres({
+            title.pk: item.get('genre', ())
+            for title, item in zip(titles, items)
+        })
+    bump_version('titles')
+    return titles
+
+
+def bulk_update_titles(updates):
+    """Изменяет произведения пакетно в одной транзакции.
+
+    Args:
+        updates (list): пары (произведение, словарь с новыми значениями
+        полей), genre - список объектов жанров.
+
+    Returns:
+        list: измененные произведения.
+    """
+
+    fields = set()
+    genres = {}
+    ranked = set()
+    for title, data in updates:
+        for field, value in data.items():
+            if field == 'genre':
+                genres[title.pk] = value
+                title.genre_mask = get_genre_mask(value)
+                fields.add('genre_mask')
+                continue
+            if (field == 'category'
+                    and title.category_id != getattr(value, 'pk', None)):
+                ranked.add(title.pk)
+            setattr(title, field, value)
+            fields.add(field)
+    titles = [title for title, data in updates]
+    with transaction.atomic():
+        if fields:
+            Title.objects.bulk_update(titles, sorted(fields))
+        if genres:
+            # Без обработчиков post_delete: рейтинг перестраивается ниже
+            # один раз для всех произведений.
+            links = TitlesGenres.objects.filter(title_id__in=list(genres))
+            links._raw_delete(links.db)
+            _create_title_genres(genres)
+        if ranked or genres:
+            rebuild_rankings(ranked | set(genres))
+    bump_version('titles')
+    return titles
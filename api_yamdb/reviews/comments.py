@@ -0,0 +1,76 @@
+from django.db.models import (Case, Count, DateTimeField, F, OuterRef,
+                              Subquery, Value, When)
+from django.db.models.functions import Coalesce
+
+from .models import Comments, Review
+
+
+def _last_comment_date():
+    """Строит подзапрос даты последнего комментария отзыва.
+
+    Returns:
+        Subquery: подзапрос по индексу (review, -pub_date, -id).
+    """
+
+    return Subquery(Comments.objects.filter(
+        review=OuterRef('pk')
+    ).order_by('-pub_date', '-id').values('pub_date')[:1])
+
+
+def add_comment(review_id, pub_date):
+    """Атомарно учитывает новый комментарий в счетчиках отзыва.
+
+    Args:
+        review_id (int): id отзыва.
+        pub_date (datetime): дата комментария.
+    """
+
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + 1,
+        last_comment_date=Case(
+            When(last_comment_date__gt=pub_date, then=F('last_comment_date')),
+            default=Value(pub_date),
+            output_field=DateTimeField()
+        )
+    )
+
+
+def remove_comment(review_id):
+    """Атомарно учитывает удаление комментария в счетчиках отзыва.
+
+    Args:
+        review_id (int): id отзыва.
+    """
+
+    Review.objects.filter(pk=review_id, comments_count__gt=0).update(
+        comments_count=F('comments_count') - 1,
+        last_comment_date=_last_comment_date()
+    )
+
+
+def recalculate_comment_counts(title_ids=None, review_ids=None):
+    """Пересчитывает счетчики комментариев по таблице комментариев.
+
+    Args:
+        title_ids (iterable, optional): id произведений, отзывы которых
+        нужно пересчитать.
+        review_ids (iterable, optional): id отзывов. Defaults to None,
+        если не заданы ни title_ids, ни review_ids, пересчитываются все
+        отзывы.
+
+    Returns:
+        int: количество обновленных отзывов.
+    """
+
+    counts = Comments.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review').annotate(total=Count('pk')).values('total')
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        reviews = reviews.filter(title_id__in=title_ids)
+    if review_ids is not None:
+        reviews = reviews.filter(pk__in=review_ids)
+    return reviews.update(
+        comments_count=Coalesce(Subquery(counts), 0),
+        last_comment_date=_last_comment_date()
+    )
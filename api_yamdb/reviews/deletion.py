@@ -0,0 +1,151 @@
+from core.versions import bump_version
+from django.db import transaction
+
+from .genres import update_genre_masks
+from .models import (Comments, Review, Title, TitleRanking, TitleScore,
+                     TitlesGenres)
+
+DELETE_BATCH_SIZE = 500
+
+
+def chunks(ids, size=None):
+    """Разбивает список id на части по size элементов.
+
+    Args:
+        ids (list): id.
+        size (int, optional): размер части. Defaults to None, тогда
+        используется DELETE_BATCH_SIZE.
+    """
+
+    size = size or DELETE_BATCH_SIZE
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def raw_delete(queryset):
+    """Удаляет строки одним DELETE без загрузки объектов и сигналов.
+
+    Индексы поиска SQLite обновляются триггерами, счетчики пересчитывает
+    вызывающий код.
+
+    Args:
+        queryset (QuerySet): удаляемые строки.
+    """
+
+    queryset._raw_delete(queryset.db)
+
+
+def process_in_chunks(queryset, action, fields=('pk',)):
+    """Обрабатывает строки запроса частями, каждую в своей транзакции.
+
+    За раз в память загружаются только значения fields одной части, а
+    блокировка записи держится только на время обработки части. Запрос
+    перечитывается после каждой части, поэтому action должен убирать
+    обработанные строки из его выборки.
+
+    Args:
+        queryset (QuerySet): обрабатываемые строки.
+        action (callable): получает список строк части (кортежей fields).
+        fields (tuple, optional): загружаемые поля.
+    """
+
+    queryset = queryset.order_by()
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.values_list(*fields)[:DELETE_BATCH_SIZE]
+            )
+            if not rows:
+                return
+            action(rows)
+
+
+def _delete_rows(model):
+    """Возвращает действие, удаляющее строки модели по id части."""
+
+    def action(rows):
+        raw_delete(model.objects.filter(pk__in=[row[0] for row in rows]))
+    return action
+
+
+def _delete_reviews(rows):
+    """Удаляет часть отзывов вместе с оставшимися комментариями."""
+
+    review_ids = [row[0] for row in rows]
+    raw_delete(Comments.objects.filter(review_id__in=review_ids))
+    raw_delete(Review.objects.filter(pk__in=review_ids))
+    bump_version(*(f'comments:{review_id}' for review_id in review_ids))
+
+
+def delete_title(title):
+    """Удаляет произведение, каскадно удаляя связанные строки частями.
+
+    Args:
+        title (Title): произведение.
+    """
+
+    for queryset in (
+        Comments.objects.filter(review__title_id=title.pk),
+        TitleRanking.objects.filter(title_id=title.pk),
+        TitleScore.objects.filter(title_id=title.pk),
+        TitlesGenres.objects.filter(title_id=title.pk),
+    ):
+        process_in_chunks(queryset, _delete_rows(queryset.model))
+    process_in_chunks(
+        Review.objects.filter(title_id=title.pk), _delete_reviews
+    )
+    bump_version('comments:feed', f'reviews:{title.pk}')
+    # Связанных строк не осталось, обработчики сигналов самого
+    # произведения срабатывают как обычно.
+    title.delete()
+
+
+def _detach_titles(rows):
+    """Убирает категорию у части произведений и их строк рейтинга."""
+
+    title_ids = [row[0] for row in rows]
+    Title.objects.filter(pk__in=title_ids).update(category=None)
+    TitleRanking.objects.filter(title_id__in=title_ids).update(
+        category=None
+    )
+
+
+def delete_category(category):
+    """Удаляет категорию, убирая ее у произведений частями.
+
+    Args:
+        category (Category): категория.
+    """
+
+    process_in_chunks(
+        Title.objects.filter(category_id=category.pk), _detach_titles
+    )
+    bump_version('titles')
+    category.delete()
+
+
+def _unlink_genre(rows):
+    """Удаляет часть связей с жанром и пересчитывает маски жанров."""
+
+    raw_delete(TitlesGenres.objects.filter(pk__in=[row[0] for row in rows]))
+    update_genre_masks({row[1] for row in rows})
+
+
+def delete_genre(genre):
+    """Удаляет жанр, убирая его у произведений частями.
+
+    Args:
+        genre (Genre): жанр.
+    """
+
+    process_in_chunks(
+        TitlesGenres.objects.filter(genre_id=genre.pk),
+        _unlink_genre,
+        ('pk', 'title_id')
+    )
+    process_in_chunks(
+        TitleRanking.objects.filter(genre_id=genre.pk),
+        _delete_rows(TitleRanking)
+    )
+    bump_version('titles')
+    genre.delete()
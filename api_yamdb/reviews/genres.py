@@ -0,0 +1,106 @@
+from collections import defaultdict
+
+from core.versions import bump_version
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Genre, Title, TitlesGenres
+
+# Старший бит знакового 64-битного числа не используется.
+MAX_GENRE_BITS = 63
+UPDATE_BATCH_SIZE = 500
+
+
+def get_genre_mask(genres):
+    """Возвращает битовую маску жанров.
+
+    Args:
+        genres (iterable): объекты жанров.
+
+    Returns:
+        int: маска из битов жанров, у которых есть бит.
+    """
+
+    mask = 0
+    for genre in genres:
+        if genre.bit is not None:
+            mask |= 1 << genre.bit
+    return mask
+
+
+def assign_genre_bits(retries=3):
+    """Назначает свободные биты жанрам, у которых их еще нет.
+
+    Жанры без свободного бита остаются без него, фильтр по ним идет
+    через таблицу связей.
+
+    Args:
+        retries (int, optional): количество попыток, если бит успели
+        занять параллельно.
+
+    Returns:
+        int: количество жанров, получивших бит.
+    """
+
+    for attempt in range(retries):
+        try:
+            with transaction.atomic():
+                used = set(Genre.objects.filter(
+                    bit__isnull=False
+                ).values_list('bit', flat=True))
+                free = iter(sorted(set(range(MAX_GENRE_BITS)) - used))
+                genres = Genre.objects.filter(
+                    bit__isnull=True
+                ).order_by('pk').values_list('pk', flat=True)
+                assigned = 0
+                for pk, bit in zip(genres, free):
+                    assigned += Genre.objects.filter(
+                        pk=pk, bit__isnull=True
+                    ).update(bit=bit)
+        except IntegrityError:
+            continue
+        if assigned:
+            bump_version('genres')
+        return assigned
+    return 0
+
+
+def clear_genre_bit(genre):
+    """Убирает бит жанра из масок всех произведений.
+
+    Args:
+        genre (Genre): жанр.
+    """
+
+    if genre.bit is None:
+        return
+    value = 1 << genre.bit
+    Title.objects.filter(genre_mask__has_all=value).update(
+        genre_mask=F('genre_mask').bitand(~value)
+    )
+
+
+def update_genre_masks(title_ids=None):
+    """Пересчитывает маски жанров произведений по таблице связей.
+
+    Args:
+        title_ids (iterable, optional): id произведений. Defaults to None,
+        тогда пересчитываются все произведения.
+    """
+
+    titles = Title.objects.all()
+    links = TitlesGenres.objects.filter(genre__bit__isnull=False)
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+        links = links.filter(title_id__in=title_ids)
+    masks = dict.fromkeys(titles.values_list('pk', flat=True), 0)
+    for title_id, bit in links.values_list('title_id', 'genre__bit'):
+        masks[title_id] |= 1 << bit
+    groups = defaultdict(list)
+    for title_id, mask in masks.items():
+        groups[mask].append(title_id)
+    for mask, ids in groups.items():
+        for start in range(0, len(ids), UPDATE_BATCH_SIZE):
+            Title.objects.filter(
+                pk__in=ids[start:start + UPDATE_BATCH_SIZE]
+            ).update(genre_mask=mask)
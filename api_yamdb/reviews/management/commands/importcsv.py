@@ -3,8 +3,12 @@ import csv
 from django.core.management.base import BaseCommand
 
 from api_yamdb.settings import BASE_DIR
+from reviews.comments import recalculate_comment_counts
+from reviews.genres import assign_genre_bits, update_genre_masks
 from reviews.models import (Category, Comments, Genre, Review, Title,
                             TitlesGenres, User)
+from reviews.rankings import rebuild_rankings
+from reviews.ratings import recalculate_ratings, recalculate_scores
 
 FILES = [
     f'{BASE_DIR}\\static\\data\\category.csv',
@@ -61,11 +65,12 @@ class Command(BaseCommand):
                     open(file, encoding='utf-8'), delimiter=','
                 )
                 TitlesGenres.objects.bulk_create(
-                    TitlesGenres(
+                    (TitlesGenres(
                         id=int(row[0]),
                         title=Title.objects.get(id=int(row[1])),
                         genre=Genre.objects.get(id=int(row[2])),
-                    ) for row in list(table)[1:]
+                    ) for row in list(table)[1:]),
+                    ignore_conflicts=True
                 )
             elif 'users.csv' in file:
                 table = csv.reader(
@@ -111,3 +116,9 @@ class Command(BaseCommand):
                 )
             else:
                 print('Такой таблицы нет в базе данных')
+        recalculate_ratings()
+        recalculate_scores()
+        rebuild_rankings()
+        assign_genre_bits()
+        update_genre_masks()
+        recalculate_comment_counts()
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import User
+from reviews.purge import purge_user
+
+
+class Command(BaseCommand):
+    help = ('Delete users marked for deletion together with their reviews '
+            'and comments, e.g. to resume purges interrupted by a restart')
+
+    def report(self, progress):
+        comments, reviews = progress['comments'], progress['reviews']
+        self.stdout.write(
+            f'  комментарии {comments["deleted"]}/{comments["total"]}, '
+            f'отзывы {reviews["deleted"]}/{reviews["total"]}'
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(
+            deleted_at__isnull=False
+        ).values_list('pk', 'username')
+        for user_id, username in users:
+            self.stdout.write(f'Удаление пользователя {username}')
+            purge_user(user_id, self.report)
+        self.stdout.write(f'Удалено пользователей: {len(users)}')
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from reviews.comments import recalculate_comment_counts
+from reviews.genres import assign_genre_bits, update_genre_masks
+from reviews.rankings import rebuild_rankings
+from reviews.ratings import recalculate_ratings, recalculate_scores
+
+
+class Command(BaseCommand):
+    help = ('Recalculate title ratings, score counts, leaderboards, '
+            'genre masks and review comment counts')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids',
+            nargs='*',
+            type=int,
+            help='Title ids to recalculate, all titles by default'
+        )
+
+    def handle(self, *args, **options):
+        title_ids = options['title_ids'] or None
+        updated = recalculate_ratings(title_ids)
+        recalculate_scores(title_ids)
+        rebuild_rankings(title_ids)
+        assign_genre_bits()
+        update_genre_masks(title_ids)
+        recalculate_comment_counts(title_ids)
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}')
@@ -0,0 +1,47 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:32
+
+from django.db import migrations, models
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    scores = Review.objects.filter(
+        title=OuterRef('pk'),
+        score__isnull=False
+    ).order_by().values('title')
+    rating_sum = Subquery(scores.annotate(total=Sum('score')).values('total'))
+    rating_count = Subquery(scores.annotate(total=Count('pk')).values('total'))
+    Title.objects.update(
+        rating_sum=Coalesce(rating_sum, 0),
+        rating_count=Coalesce(rating_count, 0),
+        rating=Cast(rating_sum, FloatField()) / rating_count
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_auto_20220712_0626'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_rankings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleRanking = apps.get_model('reviews', 'TitleRanking')
+    TitlesGenres = apps.get_model('reviews', 'TitlesGenres')
+    titles = Title.objects.filter(
+        rating_count__gte=getattr(settings, 'LEADERBOARD_MIN_REVIEWS', 3)
+    )
+    rankings = [
+        TitleRanking(title_id=title.pk, category_id=title.category_id,
+                     rating=title.rating, rating_count=title.rating_count)
+        for title in titles
+    ]
+    rankings.extend(
+        TitleRanking(title_id=link.title_id, genre_id=link.genre_id,
+                     category_id=link.title.category_id,
+                     rating=link.title.rating,
+                     rating_count=link.title.rating_count)
+        for link in TitlesGenres.objects.filter(
+            title__in=titles
+        ).select_related('title')
+    )
+    TitleRanking.objects.bulk_create(rankings)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.FloatField(verbose_name='Рейтинг')),
+                ('rating_count', models.PositiveIntegerField(verbose_name='Количество оценок')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='rankings', to='reviews.Category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='reviews.Genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Рейтинг произведений',
+                'default_related_name': 'rankings',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['genre', 'category', '-rating'], name='ranking_genre_category_idx'),
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:54
+
+from collections import defaultdict
+
+import core.fields
+from django.db import migrations, models
+
+
+def fill_genre_masks(apps, schema_editor):
+    Genre = apps.get_model('reviews', 'Genre')
+    Title = apps.get_model('reviews', 'Title')
+    TitlesGenres = apps.get_model('reviews', 'TitlesGenres')
+    genres = Genre.objects.order_by('pk').values_list('pk', flat=True)
+    bits = dict(zip(genres, range(63)))
+    for pk, bit in bits.items():
+        Genre.objects.filter(pk=pk).update(bit=bit)
+    masks = defaultdict(int)
+    for title_id, genre_id in TitlesGenres.objects.values_list(
+        'title_id', 'genre_id'
+    ):
+        if genre_id in bits:
+            masks[title_id] |= 1 << bits[genre_id]
+    groups = defaultdict(list)
+    for title_id, mask in masks.items():
+        groups[mask].append(title_id)
+    for mask, ids in groups.items():
+        for start in range(0, len(ids), 500):
+            Title.objects.filter(pk__in=ids[start:start + 500]).update(
+                genre_mask=mask
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='genre',
+            name='bit',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, unique=True, verbose_name='Бит в маске жанров'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='genre_mask',
+            field=core.fields.BitmaskField(default=0, editable=False, verbose_name='Маска жанров'),
+        ),
+        migrations.RunPython(fill_genre_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:56
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_genres(apps, schema_editor):
+    TitlesGenres = apps.get_model('reviews', 'TitlesGenres')
+    duplicates = TitlesGenres.objects.values('title', 'genre').annotate(
+        first=Min('pk'), total=Count('pk')
+    ).filter(total__gt=1)
+    for row in duplicates:
+        TitlesGenres.objects.filter(
+            title_id=row['title'], genre_id=row['genre']
+        ).exclude(pk=row['first']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_genre_mask'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_genres, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['review', '-pub_date', '-id'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titlesgenres',
+            index=models.Index(fields=['genre', 'title'], name='titlesgenres_genre_title_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titlesgenres',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_title_genre'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comments = apps.get_model('reviews', 'Comments')
+    comments = Comments.objects.filter(review=OuterRef('pk')).order_by()
+    Review.objects.update(
+        comments_count=Coalesce(Subquery(
+            comments.values('review').annotate(
+                total=Count('pk')
+            ).values('total')
+        ), 0),
+        last_comment_date=Subquery(
+            comments.order_by('-pub_date').values('pub_date')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='last_comment_date',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата последнего комментария'),
+        ),
+        migrations.RunPython(fill_comments_counts, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+from core.fields import BitmaskField
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
@@ -18,8 +19,14 @@ class User(AbstractUser):
         role (str): роль.
         bio (str): о себе.
         confirmation_code (str): код подтверждения, для получения токена.
+        deleted_at (datetime): дата запроса на удаление, пока отзывы и
+        комментарии пользователя удаляются в фоне.
     """
 
+    ADMIN = 'admin'
+    MODERATOR = 'moderator'
+    USER = 'user'
+
     username = models.CharField(
         'Username',
         max_length=150,
@@ -38,6 +45,12 @@ class User(AbstractUser):
         'Секретный код',
         max_length=4,
         blank=True, )
+    deleted_at = models.DateTimeField(
+        'Дата удаления',
+        blank=True,
+        null=True,
+        editable=False
+    )
 
     @property
     def is_admin(self):
@@ -83,7 +96,20 @@ class Category(CategoryGenreModel):
 
 
 class Genre(CategoryGenreModel):
-    """Модель для жанра."""
+    """Модель для жанра.
+
+    Attributes:
+        bit (int): номер бита жанра в маске жанров произведения, None
+        если свободных битов не осталось.
+    """
+
+    bit = models.PositiveSmallIntegerField(
+        verbose_name='Бит в маске жанров',
+        blank=True,
+        null=True,
+        unique=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Жанр'
@@ -101,6 +127,19 @@ class TitlesGenres(models.Model):
     title = models.ForeignKey('Title', on_delete=models.CASCADE)
     genre = models.ForeignKey('Genre', on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_title_genre'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'], name='titlesgenres_genre_title_idx'
+            ),
+        ]
+
 
 class Title(models.Model):
     """Модель для произведения.
@@ -111,6 +150,12 @@ class Title(models.Model):
         category (int): категория.
         description (str): описание.
         genre (int): жанр.
+        rating_sum (int): сумма оценок из отзывов.
+        rating_count (int): количество оценок из отзывов.
+        rating (float): средняя оценка, None если оценок нет.
+        weighted_rating (float): байесовская средняя оценка, None если
+        оценок нет.
+        genre_mask (int): биты жанров произведения.
     """
 
     name = models.TextField(verbose_name='Название произведения')
@@ -135,10 +180,62 @@ class Title(models.Model):
         verbose_name='Жанр',
         through='TitlesGenres'
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        blank=True,
+        null=True,
+        editable=False
+    )
+    weighted_rating = models.FloatField(
+        verbose_name='Взвешенный рейтинг',
+        blank=True,
+        null=True,
+        editable=False
+    )
+    genre_mask = BitmaskField(
+        verbose_name='Маска жанров',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['rating'], name='title_rating_idx'),
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(
+                fields=['rating_count'], name='title_rating_count_idx'
+            ),
+            models.Index(
+                fields=['weighted_rating'], name='title_weighted_idx'
+            ),
+            models.Index(
+                fields=['category', 'rating'],
+                name='title_category_rating_idx'
+            ),
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+            models.Index(
+                fields=['category', 'rating_count'],
+                name='title_category_count_idx'
+            ),
+            models.Index(
+                fields=['category', 'weighted_rating'],
+                name='title_category_weighted_idx'
+            ),
+        ]
         default_related_name = 'titles'
 
     def __str__(self):
@@ -184,6 +281,9 @@ class Review(ReviewCommentModel):
     Attributes:
         title (int): id произведения.
         score (int): оценка.
+        comments_count (int): количество комментариев.
+        last_comment_date (datetime): дата последнего комментария, None
+        если комментариев нет.
     """
 
     title = models.ForeignKey(
@@ -200,6 +300,17 @@ class Review(ReviewCommentModel):
         ],
         verbose_name='Оценка'
     )
+    comments_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев',
+        default=0,
+        editable=False
+    )
+    last_comment_date = models.DateTimeField(
+        verbose_name='Дата последнего комментария',
+        blank=True,
+        null=True,
+        editable=False
+    )
 
     class Meta:
         constraints = [
@@ -208,6 +319,12 @@ class Review(ReviewCommentModel):
                 name='unique_review'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         default_related_name = 'reviews'
@@ -227,6 +344,95 @@ class Comments(ReviewCommentModel):
     )
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+
+
+class TitleScore(models.Model):
+    """Модель для количества оценок произведения по каждому баллу.
+
+    Attributes:
+        title (int): id произведения.
+        score (int): оценка.
+        count (int): количество отзывов с этой оценкой.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+    )
+    score = models.PositiveSmallIntegerField(verbose_name='Оценка')
+    count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'],
+                name='unique_title_score'
+            )
+        ]
+        verbose_name = 'Количество оценок'
+        verbose_name_plural = 'Количество оценок'
+        default_related_name = 'scores'
+
+
+class TitleRanking(models.Model):
+    """Модель для материализованного рейтинга лучших произведений.
+
+    Для каждого произведения с достаточным количеством оценок хранится
+    строка без жанра (для выборки по всем жанрам) и по строке на каждый
+    его жанр.
+
+    Attributes:
+        title (int): id произведения.
+        category (int): id категории произведения.
+        genre (int): id жанра, None для строки по всем жанрам.
+        rating (float): средняя оценка.
+        rating_count (int): количество оценок.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+    )
+    category = models.ForeignKey(
+        Category,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        verbose_name='Категория',
+    )
+    genre = models.ForeignKey(
+        Genre,
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        verbose_name='Жанр',
+    )
+    rating = models.FloatField(verbose_name='Рейтинг')
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок'
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['genre', 'category', '-rating'],
+                name='ranking_genre_category_idx'
+            ),
+        ]
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Рейтинг произведений'
+        default_related_name = 'rankings'
@@ -0,0 +1,89 @@
+from core.versions import bump_version
+from django.db import transaction
+
+from .comments import recalculate_comment_counts
+from .deletion import chunks, process_in_chunks, raw_delete
+from .models import Comments, Review
+from .rankings import rebuild_rankings
+from .ratings import recalculate_ratings, recalculate_scores
+
+
+def delete_reviews(reviews):
+    """Удаляет отзывы вместе с комментариями частями.
+
+    Каждая часть удаляется в своей транзакции, рейтинг, распределение
+    оценок и рейтинг лучших произведений пересчитываются один раз для
+    каждого затронутого произведения после удаления всех частей.
+
+    Args:
+        reviews (QuerySet): удаляемые отзывы.
+
+    Returns:
+        int: количество удаленных отзывов.
+    """
+
+    review_ids = set()
+    title_ids = set()
+
+    def delete_chunk(rows):
+        chunk = [pk for pk, title_id in rows]
+        raw_delete(Comments.objects.filter(review_id__in=chunk))
+        raw_delete(Review.objects.filter(pk__in=chunk))
+        review_ids.update(chunk)
+        title_ids.update(title_id for pk, title_id in rows)
+
+    process_in_chunks(reviews, delete_chunk, ('pk', 'title_id'))
+    if not review_ids:
+        return 0
+    for chunk in chunks(sorted(title_ids)):
+        with transaction.atomic():
+            recalculate_ratings(chunk)
+            recalculate_scores(chunk)
+            rebuild_rankings(chunk)
+    bump_version(
+        'titles',
+        'comments:feed',
+        *(f'reviews:{title_id}' for title_id in title_ids),
+        *(f'comments:{review_id}' for review_id in review_ids)
+    )
+    return len(review_ids)
+
+
+def delete_comments(comments):
+    """Удаляет комментарии частями.
+
+    Каждая часть удаляется в своей транзакции, счетчики комментариев
+    пересчитываются один раз для каждого затронутого отзыва после
+    удаления всех частей.
+
+    Args:
+        comments (QuerySet): удаляемые комментарии.
+
+    Returns:
+        int: количество удаленных комментариев.
+    """
+
+    deleted = 0
+    review_ids = set()
+    title_ids = set()
+
+    def delete_chunk(rows):
+        nonlocal deleted
+        raw_delete(Comments.objects.filter(pk__in=[row[0] for row in rows]))
+        deleted += len(rows)
+        review_ids.update(row[1] for row in rows)
+        title_ids.update(row[2] for row in rows)
+
+    process_in_chunks(
+        comments, delete_chunk, ('pk', 'review_id', 'review__title_id')
+    )
+    if not deleted:
+        return 0
+    for chunk in chunks(sorted(review_ids)):
+        recalculate_comment_counts(review_ids=chunk)
+    bump_version(
+        'comments:feed',
+        *(f'reviews:{title_id}' for title_id in title_ids),
+        *(f'comments:{review_id}' for review_id in review_ids)
+    )
+    return deleted
@@ -0,0 +1,160 @@
+from core.jobs import run_in_background
+from core.versions import bump_version
+from django.core.cache import cache
+from django.utils import timezone
+
+from .comments import recalculate_comment_counts
+from .deletion import process_in_chunks, raw_delete
+from .models import Comments, Review, User
+from .rankings import rebuild_rankings
+from .ratings import recalculate_ratings, recalculate_scores
+
+PROGRESS_KEY = 'purge:{}'
+PROGRESS_TIMEOUT = 60 * 60 * 24
+
+
+def get_purge_progress(username):
+    """Возвращает ход удаления пользователя.
+
+    Args:
+        username (str): имя пользователя.
+
+    Returns:
+        dict: состояние (status: pending, running или done) и количество
+        удаленных и всего комментариев и отзывов либо None, если удаление
+        не запрашивалось.
+    """
+
+    return cache.get(PROGRESS_KEY.format(username))
+
+
+def request_user_purge(user):
+    """Деактивирует пользователя и ставит удаление его данных в очередь.
+
+    Args:
+        user (User): пользователь.
+    """
+
+    user.is_active = False
+    user.deleted_at = timezone.now()
+    user.save(update_fields=('is_active', 'deleted_at'))
+    cache.set(
+        PROGRESS_KEY.format(user.username),
+        {'status': 'pending'},
+        PROGRESS_TIMEOUT
+    )
+    run_in_background(purge_user, user.pk)
+
+
+class UserPurge(object):
+    """Удаление пользователя вместе с отзывами и комментариями частями.
+
+    Каждая часть удаляется в своей транзакции вместе с пересчетом
+    рейтинга затронутых произведений, поэтому при повторном запуске после
+    сбоя удаление продолжается с оставшихся строк, а уже удаленные части
+    ничего не оставляют недосчитанным.
+
+    Attributes:
+        user (User): удаляемый пользователь.
+        report (callable): получает словарь с ходом удаления после каждой
+        части.
+    """
+
+    def __init__(self, user, report=None):
+        self.user = user
+        self.report = report
+        self.progress = {
+            'status': 'running',
+            'comments': {
+                'deleted': 0,
+                'total': Comments.objects.filter(author=user).count(),
+            },
+            'reviews': {
+                'deleted': 0,
+                'total': Review.objects.filter(author=user).count(),
+            },
+        }
+
+    def save_progress(self):
+        cache.set(
+            PROGRESS_KEY.format(self.user.username),
+            self.progress,
+            PROGRESS_TIMEOUT
+        )
+        if self.report is not None:
+            self.report(self.progress)
+
+    def delete_comments(self, rows):
+        """Удаляет часть комментариев и пересчитывает счетчики отзывов."""
+
+        review_ids = {row[1] for row in rows}
+        raw_delete(Comments.objects.filter(pk__in=[row[0] for row in rows]))
+        recalculate_comment_counts(review_ids=review_ids)
+        bump_version(
+            'comments:feed',
+            *(f'comments:{review_id}' for review_id in review_ids),
+            *(f'reviews:{title_id}' for title_id in {row[2] for row in rows})
+        )
+        self.progress['comments']['deleted'] += len(rows)
+        self.save_progress()
+
+    def delete_reviews(self, rows):
+        """Удаляет часть отзывов с комментариями и пересчитывает рейтинг."""
+
+        review_ids = [row[0] for row in rows]
+        title_ids = sorted({row[1] for row in rows})
+        raw_delete(Comments.objects.filter(review_id__in=review_ids))
+        raw_delete(Review.objects.filter(pk__in=review_ids))
+        recalculate_ratings(title_ids)
+        recalculate_scores(title_ids)
+        rebuild_rankings(title_ids)
+        bump_version(
+            'titles',
+            'comments:feed',
+            *(f'reviews:{title_id}' for title_id in title_ids),
+            *(f'comments:{review_id}' for review_id in review_ids)
+        )
+        self.progress['reviews']['deleted'] += len(rows)
+        self.save_progress()
+
+    def run(self):
+        """Удаляет данные пользователя и его самого.
+
+        Returns:
+            dict: итоговое состояние удаления.
+        """
+
+        self.save_progress()
+        process_in_chunks(
+            Comments.objects.filter(author=self.user),
+            self.delete_comments,
+            ('pk', 'review_id', 'review__title_id')
+        )
+        process_in_chunks(
+            Review.objects.filter(author=self.user),
+            self.delete_reviews,
+            ('pk', 'title_id')
+        )
+        self.user.delete()
+        self.progress['status'] = 'done'
+        self.save_progress()
+        return self.progress
+
+
+def purge_user(user_id, report=None):
+    """Удаляет помеченного на удаление пользователя и его данные.
+
+    Args:
+        user_id (int): id пользователя.
+        report (callable, optional): получает ход удаления после каждой
+        части.
+
+    Returns:
+        dict: итоговое состояние удаления либо None, если пользователь не
+        найден или не помечен на удаление.
+    """
+
+    user = User.objects.filter(pk=user_id, deleted_at__isnull=False).first()
+    if user is None:
+        return None
+    return UserPurge(user, report).run()
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import transaction
+
+from .models import Title, TitleRanking, TitlesGenres
+
+
+def get_min_reviews():
+    """Минимальное количество оценок для попадания в рейтинг."""
+
+    return getattr(settings, 'LEADERBOARD_MIN_REVIEWS', 3)
+
+
+def rebuild_rankings(title_ids=None):
+    """Заново строит строки рейтинга для произведений.
+
+    Args:
+        title_ids (iterable, optional): id произведений. Defaults to None,
+        тогда рейтинг строится для всех произведений.
+    """
+
+    rankings = TitleRanking.objects.all()
+    titles = Title.objects.filter(rating_count__gte=get_min_reviews())
+    links = TitlesGenres.objects.all()
+    if title_ids is not None:
+        rankings = rankings.filter(title_id__in=title_ids)
+        titles = titles.filter(pk__in=title_ids)
+        links = links.filter(title_id__in=title_ids)
+    titles = {
+        title['pk']: title for title in titles.values(
+            'pk', 'category_id', 'rating', 'rating_count'
+        )
+    }
+    genres = [(None, title_id) for title_id in titles]
+    genres.extend(
+        (genre_id, title_id) for genre_id, title_id in links.filter(
+            title_id__in=list(titles)
+        ).values_list('genre_id', 'title_id')
+    )
+    with transaction.atomic():
+        rankings.delete()
+        TitleRanking.objects.bulk_create(
+            TitleRanking(
+                title_id=title_id,
+                genre_id=genre_id,
+                category_id=titles[title_id]['category_id'],
+                rating=titles[title_id]['rating'],
+                rating_count=titles[title_id]['rating_count'],
+            ) for genre_id, title_id in genres
+        )
+
+
+def refresh_title_ranking(title_id):
+    """Обновляет рейтинг произведения после изменения его оценок.
+
+    Если произведение уже есть в рейтинге и осталось в нем, строки
+    обновляются одним UPDATE, иначе удаляются или строятся заново.
+
+    Args:
+        title_id (int): id произведения.
+    """
+
+    title = Title.objects.filter(pk=title_id).values(
+        'rating', 'rating_count'
+    ).first()
+    rankings = TitleRanking.objects.filter(title_id=title_id)
+    if title is None or title['rating_count'] < get_min_reviews():
+        rankings.delete()
+    elif not rankings.update(**title):
+        rebuild_rankings([title_id])
+
+
+def get_top_titles(category_id=None, genre_id=None, limit=10):
+    """Возвращает id лучших произведений по рейтингу.
+
+    Args:
+        category_id (int, optional): id категории.
+        genre_id (int, optional): id жанра.
+        limit (int, optional): количество произведений.
+
+    Returns:
+        list: id произведений от лучшего к худшему.
+    """
+
+    rankings = TitleRanking.objects.filter(genre_id=genre_id)
+    if category_id is not None:
+        rankings = rankings.filter(category_id=category_id)
+    return list(rankings.order_by(
+        '-rating', '-rating_count', 'title_id'
+    ).values_list('title_id', flat=True)[:limit])
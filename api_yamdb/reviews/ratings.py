@@ -0,0 +1,201 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import (Case, Count, F, FloatField, OuterRef, Subquery,
+                              Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce
+
+from .models import Review, Title, TitleScore
+
+
+def get_rating_prior():
+    """Возвращает априорные среднюю оценку и вес байесовского рейтинга.
+
+    Returns:
+        tuple: (средняя оценка, количество априорных оценок).
+    """
+
+    return (
+        float(getattr(settings, 'RATING_PRIOR_MEAN', 5.5)),
+        int(getattr(settings, 'RATING_PRIOR_COUNT', 5))
+    )
+
+
+def weighted_rating(rating_sum, rating_count):
+    """Строит выражение байесовского рейтинга.
+
+    Рейтинг равен (S + m * C) / (N + m), где S и N - сумма и количество
+    оценок, C и m - априорные средняя оценка и количество оценок.
+
+    Args:
+        rating_sum (Expression): сумма оценок.
+        rating_count (Expression): количество оценок.
+
+    Returns:
+        Expression: выражение для update() или annotate().
+    """
+
+    mean, count = get_rating_prior()
+    return (
+        (Cast(rating_sum, FloatField()) + Value(mean * count))
+        / (rating_count + Value(count))
+    )
+
+
+def change_rating(title_id, score_delta, count_delta):
+    """Атомарно изменяет хранимый рейтинг произведения.
+
+    Сумма и количество оценок изменяются одним UPDATE через F-выражения,
+    поэтому параллельные отзывы не затирают изменения друг друга.
+
+    Args:
+        title_id (int): id произведения.
+        score_delta (int): на сколько изменить сумму оценок.
+        count_delta (int): на сколько изменить количество оценок.
+    """
+
+    if not score_delta and not count_delta:
+        return
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    no_scores = When(rating_count=-count_delta, then=Value(None))
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Case(
+            no_scores,
+            default=Cast(rating_sum, FloatField()) / rating_count,
+            output_field=FloatField()
+        ),
+        weighted_rating=Case(
+            no_scores,
+            default=weighted_rating(rating_sum, rating_count),
+            output_field=FloatField()
+        )
+    )
+
+
+def change_score_count(title_id, score, delta):
+    """Атомарно изменяет количество отзывов с оценкой score.
+
+    Args:
+        title_id (int): id произведения.
+        score (int): оценка.
+        delta (int): на сколько изменить количество.
+    """
+
+    scores = TitleScore.objects.filter(title_id=title_id, score=score)
+    if scores.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            TitleScore.objects.create(
+                title_id=title_id, score=score, count=delta
+            )
+    except IntegrityError:
+        scores.update(count=F('count') + delta)
+
+
+def replace_score(old_title_id, old_score, title_id, score):
+    """Заменяет оценку отзыва в рейтинге и распределении оценок.
+
+    Отсутствующая оценка передается как None: при добавлении отзыва
+    old_score равен None, при удалении - score.
+
+    Args:
+        old_title_id (int): id произведения, сохраненное в базе данных.
+        old_score (int): оценка, сохраненная в базе данных.
+        title_id (int): новое id произведения.
+        score (int): новая оценка.
+    """
+
+    if (old_title_id, old_score) == (title_id, score):
+        return
+    if old_title_id == title_id:
+        change_rating(
+            title_id,
+            (score or 0) - (old_score or 0),
+            (score is not None) - (old_score is not None)
+        )
+    else:
+        if old_score is not None:
+            change_rating(old_title_id, -old_score, -1)
+        if score is not None:
+            change_rating(title_id, score, 1)
+    if old_score is not None:
+        change_score_count(old_title_id, old_score, -1)
+    if score is not None:
+        change_score_count(title_id, score, 1)
+
+
+def recalculate_ratings(title_ids=None):
+    """Пересчитывает хранимый рейтинг по таблице отзывов.
+
+    Args:
+        title_ids (iterable, optional): id произведений. Defaults to None,
+        тогда пересчитываются все произведения.
+
+    Returns:
+        int: количество обновленных произведений.
+    """
+
+    scores = Review.objects.filter(
+        title=OuterRef('pk'),
+        score__isnull=False
+    ).order_by().values('title')
+    rating_sum = Subquery(scores.annotate(total=Sum('score')).values('total'))
+    rating_count = Subquery(scores.annotate(total=Count('pk')).values('total'))
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    return titles.update(
+        rating_sum=Coalesce(rating_sum, 0),
+        rating_count=Coalesce(rating_count, 0),
+        rating=Cast(rating_sum, FloatField()) / rating_count,
+        weighted_rating=weighted_rating(rating_sum, rating_count)
+    )
+
+
+def recalculate_scores(title_ids=None):
+    """Пересчитывает распределение оценок по таблице отзывов.
+
+    Args:
+        title_ids (iterable, optional): id произведений. Defaults to None,
+        тогда пересчитываются все произведения.
+    """
+
+    scores = TitleScore.objects.all()
+    reviews = Review.objects.filter(score__isnull=False)
+    if title_ids is not None:
+        scores = scores.filter(title_id__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    with transaction.atomic():
+        scores.delete()
+        TitleScore.objects.bulk_create(
+            TitleScore(title_id=row['title'], score=row['score'],
+                       count=row['count'])
+            for row in reviews.order_by().values('title', 'score').annotate(
+                count=Count('pk')
+            )
+        )
+
+
+def get_score_distribution(title_id):
+    """Возвращает количество отзывов по каждой оценке от 1 до 10.
+
+    Args:
+        title_id (int): id произведения.
+
+    Returns:
+        dict: оценка -> количество отзывов либо None, если произведения нет.
+    """
+
+    rows = list(Title.objects.filter(pk=title_id).values_list(
+        'scores__score', 'scores__count'
+    ))
+    if not rows:
+        return None
+    distribution = dict.fromkeys(range(1, 11), 0)
+    distribution.update(
+        (score, count) for score, count in rows if score is not None
+    )
+    return distribution
@@ -0,0 +1,9 @@
+from core.search import SearchIndex, register
+
+from .models import Comments, Review, Title
+
+TITLES_INDEX = register(
+    SearchIndex('titles', Title, ('name', 'description'))
+)
+REVIEWS_INDEX = register(SearchIndex('reviews', Review, ('text',)))
+COMMENTS_INDEX = register(SearchIndex('comments', Comments, ('text',)))
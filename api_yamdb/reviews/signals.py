@@ -0,0 +1,197 @@
+from core.optimization import require_fields
+from core.versions import bump_version
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+
+from .comments import add_comment, remove_comment
+from .genres import assign_genre_bits, clear_genre_bit, update_genre_masks
+from .models import (Category, Comments, Genre, Review, Title, TitleRanking,
+                     TitlesGenres, User)
+from .rankings import rebuild_rankings, refresh_title_ranking
+from .ratings import replace_score
+from .slugs import CATEGORIES, GENRES
+
+VERSION_NAMESPACES = {
+    Title: lambda title: ('titles',),
+    TitlesGenres: lambda title_genre: ('titles',),
+    Category: lambda category: ('titles', 'categories'),
+    Genre: lambda genre: ('titles', 'genres'),
+    Review: lambda review: ('titles', f'reviews:{review.title_id}'),
+    Comments: lambda comment: (
+        'comments:feed', f'comments:{comment.review_id}'
+    ),
+    User: lambda user: ('users',),
+}
+
+# Поля, которые читают обработчики post_init ниже.
+require_fields(Review, 'score')
+require_fields(User, 'username')
+
+
+@receiver(post_init, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    """Запоминает произведение и оценку, сохраненные в базе данных."""
+
+    instance._saved_score = (instance.title_id, instance.score)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """Обновляет рейтинг и распределение оценок при добавлении или
+    изменении отзыва.
+    """
+
+    old_title_id, old_score = instance._saved_score
+    if created:
+        old_score = None
+    replace_score(old_title_id, old_score, instance.title_id, instance.score)
+    if (old_title_id, old_score) != (instance.title_id, instance.score):
+        refresh_title_ranking(instance.title_id)
+        if old_title_id != instance.title_id:
+            refresh_title_ranking(old_title_id)
+    instance._saved_score = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Обновляет рейтинг и распределение оценок при удалении отзыва."""
+
+    title_id, score = instance._saved_score
+    replace_score(title_id, score, title_id, None)
+    if score is not None:
+        refresh_title_ranking(title_id)
+
+
+def bump_review_version(comment):
+    """Увеличивает счетчик версий отзывов произведения комментария."""
+
+    if Comments.review.is_cached(comment):
+        title_id = comment.review.title_id
+    else:
+        title_id = Review.objects.filter(
+            pk=comment.review_id
+        ).values_list('title_id', flat=True).first()
+    if title_id is not None:
+        bump_version(f'reviews:{title_id}')
+
+
+@receiver(post_save, sender=Comments)
+def update_comments_count_on_save(sender, instance, created, **kwargs):
+    """Обновляет счетчики комментариев отзыва при добавлении комментария."""
+
+    if created:
+        add_comment(instance.review_id, instance.pub_date)
+        bump_review_version(instance)
+
+
+@receiver(post_delete, sender=Comments)
+def update_comments_count_on_delete(sender, instance, **kwargs):
+    """Обновляет счетчики комментариев отзыва при удалении комментария."""
+
+    remove_comment(instance.review_id)
+    bump_review_version(instance)
+
+
+def bump_model_versions(sender, instance, **kwargs):
+    """Увеличивает счетчики версий, зависящие от измененного объекта."""
+
+    bump_version(*VERSION_NAMESPACES[sender](instance))
+
+
+for model in VERSION_NAMESPACES:
+    post_save.connect(bump_model_versions, sender=model)
+    post_delete.connect(bump_model_versions, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    """Обновляет версию, маски жанров и рейтинг произведений при
+    изменении их жанров.
+    """
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    bump_version('titles')
+    if not reverse:
+        update_genre_masks([instance.pk])
+        rebuild_rankings([instance.pk])
+    elif pk_set:
+        update_genre_masks(pk_set)
+        rebuild_rankings(pk_set)
+    else:
+        clear_genre_bit(instance)
+        TitleRanking.objects.filter(genre_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=TitlesGenres)
+@receiver(post_delete, sender=TitlesGenres)
+def update_title_genre(sender, instance, **kwargs):
+    """Обновляет маску жанров и рейтинг произведения при изменении связи
+    с жанром.
+    """
+
+    update_genre_masks([instance.title_id])
+    rebuild_rankings([instance.title_id])
+
+
+@receiver(post_init, sender=Title)
+def remember_category(sender, instance, **kwargs):
+    """Запоминает категорию, сохраненную в базе данных."""
+
+    instance._saved_category_id = instance.category_id
+
+
+@receiver(post_save, sender=Title)
+def update_ranking_category(sender, instance, created, **kwargs):
+    """Переносит произведение в рейтинге при смене категории."""
+
+    if not created and instance._saved_category_id != instance.category_id:
+        TitleRanking.objects.filter(title_id=instance.pk).update(
+            category_id=instance.category_id
+        )
+    instance._saved_category_id = instance.category_id
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    """Запоминает имя пользователя, сохраненное в базе данных."""
+
+    instance._saved_username = instance.username
+
+
+@receiver(post_save, sender=User)
+def bump_authored_versions(sender, instance, created, **kwargs):
+    """Сбрасывает версии отзывов и комментариев при смене имени автора."""
+
+    if not created and instance._saved_username != instance.username:
+        bump_version('reviews', 'comments')
+    instance._saved_username = instance.username
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def clear_slug_maps(sender, instance, **kwargs):
+    """Сбрасывает соответствие slug <-> id в памяти процесса."""
+
+    (CATEGORIES if sender is Category else GENRES).clear()
+
+
+@receiver(post_save, sender=Genre)
+def assign_genre_bit(sender, instance, created, **kwargs):
+    """Назначает новому жанру бит в масках жанров."""
+
+    if created:
+        assign_genre_bits()
+        instance.bit = Genre.objects.values_list(
+            'bit', flat=True
+        ).get(pk=instance.pk)
+
+
+@receiver(pre_delete, sender=Genre)
+def remove_genre_bit(sender, instance, **kwargs):
+    """Убирает бит удаляемого жанра из масок произведений."""
+
+    clear_genre_bit(instance)
@@ -0,0 +1,81 @@
+from core.versions import get_version
+
+from .models import Category, Genre
+
+
+class SlugMap(object):
+    """Хранимое в памяти процесса соответствие slug <-> id.
+
+    Подходит для маленьких и редко меняющихся таблиц. Данные загружаются
+    одним запросом и перечитываются, когда меняется счетчик версий
+    namespace (в том числе в других процессах) или после сброса
+    обработчиком сигнала.
+
+    Attributes:
+        model (Model): модель со slug.
+        namespace (str): счетчик версий модели.
+        fields (tuple): загружаемые поля кроме id.
+    """
+
+    def __init__(self, model, namespace, fields=('name', 'slug')):
+        self.model = model
+        self.namespace = namespace
+        self.fields = tuple(fields)
+        self._data = (None, {}, {})
+
+    def clear(self):
+        """Сбрасывает загруженные данные."""
+
+        self._data = (None, {}, {})
+
+    def _get_data(self):
+        """Возвращает актуальные словари slug -> строка и id -> строка.
+
+        Returns:
+            tuple: словари строк таблицы по slug и по id.
+        """
+
+        version = get_version(self.namespace)
+        loaded_version, by_slug, by_id = self._data
+        if loaded_version != version:
+            rows = list(self.model.objects.values('pk', *self.fields))
+            by_slug = {row['slug']: row for row in rows}
+            by_id = {row['pk']: row for row in rows}
+            self._data = (version, by_slug, by_id)
+        return by_slug, by_id
+
+    def get_id(self, slug):
+        """Возвращает id объекта по slug либо None, если его нет."""
+
+        row = self._get_data()[0].get(slug)
+        return None if row is None else row['pk']
+
+    def get_slug(self, pk):
+        """Возвращает slug объекта по id либо None, если его нет."""
+
+        row = self._get_data()[1].get(pk)
+        return None if row is None else row['slug']
+
+    def get(self, slug):
+        """Возвращает объект по slug без запроса к базе данных.
+
+        Args:
+            slug (str): slug объекта.
+
+        Returns:
+            Model: объект модели либо None, если его нет.
+        """
+
+        row = self._get_data()[0].get(slug)
+        if row is None:
+            return None
+        instance = self.model(
+            id=row['pk'], **{field: row[field] for field in self.fields}
+        )
+        instance._state.adding = False
+        instance._state.db = self.model.objects.db
+        return instance
+
+
+CATEGORIES = SlugMap(Category, 'categories')
+GENRES = SlugMap(Genre, 'genres', ('name', 'slug', 'bit'))
@@ -0,0 +1,226 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+    )
+    return len(context.captured_queries)
+
+
+class Test08QueriesAPI:
+
+    def check_constant_queries(self, client, url, budget):
+        client.get(url)
+        one = count_queries(client, f'{url}?limit=1')
+        many = count_queries(client, f'{url}?limit=100')
+        assert one == many, (
+            f'Проверьте, что при GET запросе `{url}` количество запросов к '
+            f'базе данных не зависит от размера страницы: {one} != {many}'
+        )
+        assert many <= budget, (
+            f'Проверьте, что при GET запросе `{url}` выполняется не более '
+            f'{budget} запросов к базе данных, выполнено {many}'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_list_queries(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        self.check_constant_queries(client, '/api/v1/titles/', 2)
+        self.check_constant_queries(
+            client, f'/api/v1/titles/{title_id}/reviews/', 2
+        )
+        self.check_constant_queries(
+            client,
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            3
+        )
+        self.check_constant_queries(auth_client(admin), '/api/v1/users/', 2)
+        self.check_constant_queries(
+            auth_client(moderator), '/api/v1/search/reviews/', 3
+        )
+        self.check_constant_queries(
+            auth_client(moderator), '/api/v1/search/comments/', 3
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_response_cache(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        for cached_url in ('/api/v1/titles/?year=2020', url):
+            client.get(cached_url)
+            assert count_queries(client, cached_url) == 0, (
+                f'Проверьте, что повторный GET запрос `{cached_url}` '
+                'выдается из кеша без запросов к базе данных'
+            )
+        assert client.get(url).json()['rating'] is None
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Отзыв', 'score': 8}
+        )
+        assert client.get(url).json()['rating'] == 8, (
+            f'Проверьте, что после добавления отзыва GET запрос `{url}` '
+            'не выдается из устаревшего кеша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_sparse_fieldsets(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        cases = (
+            ('/api/v1/titles/?fields=id,name', {'id', 'name'},
+             ('"description"', 'reviews_genre', 'reviews_category')),
+            ('/api/v1/titles/?omit=genre&omit=category,description',
+             {'id', 'name', 'year', 'rating'},
+             ('"description"', 'reviews_genre', 'reviews_category')),
+            (f'/api/v1/titles/{title_id}/reviews/?fields=id,score',
+             {'id', 'score'}, ('"text"', 'reviews_user')),
+            (f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+             '?omit=author,text', {'id', 'pub_date'},
+             ('"reviews_comments"."text"', 'reviews_user')),
+        )
+        for url, fields, pruned in cases:
+            client.get(url)
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            results = response.json()['results']
+            assert results and all(set(r) == fields for r in results), (
+                f'Проверьте, что GET запрос `{url}` выводит только поля '
+                f'{sorted(fields)}'
+            )
+            sql = ' '.join(
+                query['sql'] for query in context.captured_queries
+            )
+            for name in pruned:
+                assert name not in sql, (
+                    f'Проверьте, что при GET запросе `{url}` из базы данных '
+                    f'не загружается `{name}`'
+                )
+        response = auth_client(admin).get('/api/v1/users/?fields=username')
+        assert all(
+            set(user) == {'username'} for user in response.json()['results']
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_slug_lookups(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        url = '/api/v1/titles/?genre=drama&category=films&count=none'
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}&limit=5')
+        assert response.status_code == 200
+        assert not any(
+            '"slug" =' in query['sql'] for query in context.captured_queries
+        ), (
+            f'Проверьте, что при GET запросе `{url}` фильтр по slug '
+            'заменяется на фильтр по id без JOIN с жанрами и категориями'
+        )
+        data = {'name': 'Новое', 'year': 2001, 'category': 'books',
+                'genre': ['horror', 'comedy']}
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 201
+        assert not any(
+            '"slug" =' in query['sql'] or '"slug" IN' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при создании произведения слаги категории и '
+            'жанров не запрашиваются из базы данных'
+        )
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'}
+        )
+        data['genre'] = ['new']
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 201, (
+            'Проверьте, что новый жанр сразу доступен при создании '
+            'произведения'
+        )
+        response = client.get('/api/v1/titles/?genre=new')
+        assert response.json()['count'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_nested_parents(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[1]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client(user).post(
+                reviews_url, data={'text': 'Отзыв', 'score': 7}
+            )
+        assert response.status_code == 201
+        parent_queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_title"."id"')
+        ]
+        assert len(parent_queries) == 1, (
+            f'Проверьте, что при POST запросе `{reviews_url}` произведение '
+            'загружается из базы данных один раз'
+        )
+        review_id = response.json()['id']
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client(user).post(
+                comments_url, data={'text': 'Комментарий'}
+            )
+        assert response.status_code == 201
+        parent_queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_review"."id"')
+            or query['sql'].startswith('SELECT "reviews_title"."id"')
+        ]
+        assert len(parent_queries) == 1 and (
+            'INNER JOIN "reviews_title"' in parent_queries[0]
+        ), (
+            f'Проверьте, что при POST запросе `{comments_url}` отзыв и '
+            'произведение загружаются одним запросом'
+        )
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review_id}/comments/'
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что комментарии к отзыву другого произведения '
+            'недоступны'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_duplicate_review(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        with CaptureQueriesContext(connection) as context:
+            auth_client(user).post(url, data=data)
+        assert not any(
+            query['sql'].startswith('SELECT (1) AS "a" FROM "reviews_review"')
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что при POST запросе `{url}` повторный отзыв '
+            'отклоняется ограничением в базе данных без запроса exists()'
+        )
+        response = auth_client(user).post(url, data=data)
+        assert response.status_code == 400
+        assert response.json() == {'non_field_errors': [
+            'На произведение можно оставить не более одного отзыва'
+        ]}
+        assert len(client.get(url).json()['results']) == 1
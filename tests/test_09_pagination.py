@@ -0,0 +1,152 @@
+import json
+from base64 import b64encode
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+
+from .common import create_comments
+
+MAX_PAGES = 50
+
+
+class Test09CursorPaginationAPI:
+
+    def collect_pages(self, client, url):
+        results = []
+        response = client.get(url)
+        while True:
+            assert response.status_code == 200, (
+                f'Проверьте, что при GET запросе `{url}` с параметром '
+                '`cursor` возвращается статус 200'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                f'Проверьте, что при GET запросе `{url}` с параметром '
+                '`cursor` не считается общее количество объектов'
+            )
+            results.extend(item['id'] for item in data['results'])
+            if not data['next']:
+                return results
+            assert len(results) < MAX_PAGES * len(data['results']), (
+                f'Проверьте, что при GET запросе `{url}` с параметром '
+                '`cursor` страницы не повторяются'
+            )
+            response = client.get(data['next'])
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cursor_pages(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_id = titles[0]['id']
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/comments/',
+        ):
+            expected = [
+                item['id'] for item in client.get(url).json()['results']
+            ]
+            paged = self.collect_pages(client, f'{url}?cursor=&limit=1')
+            assert paged == expected, (
+                f'Проверьте, что при GET запросе `{url}` с параметром '
+                '`cursor` выдаются все объекты в том же порядке'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cached_count(self, client, admin_client, admin):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert client.get(url).json()['count'] == 3
+        review_id = client.get(url).json()['results'][0]['id']
+        admin_client.delete(f'{url}{review_id}/')
+        assert client.get(url).json()['count'] == 2, (
+            f'Проверьте, что при GET запросе `{url}` количество объектов '
+            'пересчитывается после удаления объекта'
+        )
+        data = client.get(f'{url}?count=none&limit=1').json()
+        assert 'count' not in data, (
+            f'Проверьте, что при GET запросе `{url}?count=none` '
+            'количество объектов не выводится'
+        )
+        assert data['next'] and len(data['results']) == 1, (
+            f'Проверьте, что при GET запросе `{url}?count=none` '
+            'выводится ссылка на следующую страницу'
+        )
+        data = client.get(data['next']).json()
+        assert data['next'] is None and len(data['results']) == 1, (
+            f'Проверьте, что при GET запросе `{url}?count=none` '
+            'на последней странице нет ссылки на следующую'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_cursor_duplicate_values(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number % 2}', year=2000)
+            for number in range(12)
+        )
+        titles = list(Title.objects.order_by('pk'))
+        cases = (
+            ('year', [title.pk for title in titles]),
+            ('-year', [title.pk for title in reversed(titles)]),
+            ('name', [title.pk for title in sorted(
+                titles, key=lambda title: (title.name, title.pk)
+            )]),
+        )
+        for ordering, expected in cases:
+            url = f'/api/v1/titles/?cursor=&ordering={ordering}&limit=3'
+            with CaptureQueriesContext(connection) as context:
+                paged = self.collect_pages(client, url)
+            assert paged == expected, (
+                f'Проверьте, что при GET запросе `{url}` страницы по курсору '
+                'выдают все объекты с одинаковыми значениями сортировки без '
+                'повторов и пропусков'
+            )
+            assert not any(
+                'OFFSET' in query['sql'] for query in context.captured_queries
+            ), (
+                f'Проверьте, что при GET запросе `{url}` страницы выбираются '
+                'без OFFSET'
+            )
+        data = client.get(
+            '/api/v1/titles/?cursor=&ordering=year&limit=5'
+        ).json()
+        data = client.get(data['next']).json()
+        previous = client.get(data['previous']).json()
+        assert [item['id'] for item in previous['results']] == [
+            title.pk for title in titles[:5]
+        ], (
+            'Проверьте, что ссылка `previous` курсора возвращает предыдущую '
+            'страницу'
+        )
+        response = client.get('/api/v1/titles/?cursor=bad')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_malformed_cursor(self, client, admin_client, admin):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url, position in (
+            ('/api/v1/titles/', [{'a': 1}]),
+            ('/api/v1/titles/', ['abc']),
+            ('/api/v1/titles/', [[1]]),
+            ('/api/v1/titles/?ordering=rating', ['abc', 1]),
+            ('/api/v1/titles/?search=Проект', ['abc', 1]),
+            (reviews_url, ['2020-13-45T00', 1]),
+            (reviews_url, ['2020-01-01T00:00:00Z', 'abc']),
+        ):
+            cursor = b64encode(json.dumps({'p': position}).encode('ascii'))
+            separator = '&' if '?' in url else '?'
+            response = client.get(
+                f'{url}{separator}cursor={cursor.decode("ascii")}'
+            )
+            assert response.status_code == 404, (
+                f'Проверьте, что при GET запросе `{url}` с поврежденным '
+                f'курсором {position} возвращается статус 404'
+            )
+        cursor = b64encode(json.dumps({'p': [None, 1]}).encode('ascii'))
+        response = client.get(
+            f'/api/v1/titles/?ordering=rating&cursor={cursor.decode("ascii")}'
+        )
+        assert response.status_code == 200
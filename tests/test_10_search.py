@@ -0,0 +1,86 @@
+import pytest
+
+from .common import auth_client, create_comments, create_titles
+
+
+class Test10SearchAPI:
+
+    def names(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.names(client, '/api/v1/titles/?name=пово') == [
+            'Поворот туда'
+        ], (
+            'Проверьте, что фильтр `name` ищет по началу слов в названии '
+            'без учета регистра'
+        )
+        assert self.names(client, '/api/v1/titles/?search=драма') == [
+            'Проект'
+        ], (
+            'Проверьте, что параметр `search` ищет по описанию произведения'
+        )
+        assert self.names(client, '/api/v1/titles/?name=драма') == [], (
+            'Проверьте, что фильтр `name` ищет только по названию'
+        )
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/',
+            data={'description': 'Поворот поворот поворот'}
+        )
+        assert self.names(client, '/api/v1/titles/?search=поворот') == [
+            'Проект', 'Поворот туда'
+        ], (
+            'Проверьте, что результаты поиска отсортированы по релевантности '
+            'и индекс обновляется при изменении произведения'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert self.names(client, '/api/v1/titles/?search=поворот') == [
+            'Поворот туда'
+        ], (
+            'Проверьте, что удаленные произведения не находятся поиском'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_comments_search(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(f'{url}?search=QWERTY321')
+        assert [review['id'] for review in response.json()['results']] == [
+            reviews[2]['id']
+        ], (
+            f'Проверьте, что при GET запросе `{url}?search=` отзывы '
+            'ищутся по тексту'
+        )
+        comments_url = f'{url}{reviews[0]["id"]}/comments/?search=qwerty123'
+        response = client.get(comments_url)
+        assert [item['id'] for item in response.json()['results']] == [
+            comments[1]['id']
+        ], (
+            'Проверьте, что при GET запросе '
+            '`/api/v1/titles/{title_id}/reviews/{review_id}/comments/?search=`'
+            ' комментарии ищутся по тексту'
+        )
+        url = '/api/v1/search/comments/?search=qwerty'
+        assert auth_client(user).get(url).status_code == 403, (
+            f'Проверьте, что GET запрос `{url}` доступен только модераторам'
+        )
+        data = auth_client(moderator).get(url).json()
+        assert data['count'] == 3 and {
+            (item['title'], item['review']) for item in data['results']
+        } == {(titles[0]['id'], reviews[0]['id'])}, (
+            f'Проверьте, что при GET запросе `{url}` выполняется поиск по '
+            'всем комментариям'
+        )
+        url = f'/api/v1/search/reviews/?search=qwerty&title={titles[1]["id"]}'
+        assert auth_client(moderator).get(url).json()['count'] == 0, (
+            f'Проверьте, что при GET запросе `{url}` отзывы фильтруются по '
+            'произведению'
+        )
@@ -0,0 +1,145 @@
+import pytest
+
+from reviews.models import Title
+
+from .common import auth_client, create_reviews
+
+
+class Test11RatingDistributionAPI:
+
+    def get_distribution(self, client, title_id):
+        url = f'/api/v1/titles/{title_id}/rating-distribution/'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` без токена авторизации '
+            'возвращается статус 200'
+        )
+        return {
+            int(score): count for score, count in response.json().items()
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_distribution(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        expected = dict.fromkeys(range(1, 11), 0)
+        expected.update({3: 1, 4: 1, 5: 1})
+        assert self.get_distribution(client, titles[0]['id']) == expected, (
+            'Проверьте, что `/api/v1/titles/{title_id}/rating-distribution/` '
+            'возвращает количество отзывов по каждой оценке от 1 до 10'
+        )
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 10}
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        expected.update({3: 0, 4: 1, 5: 0, 10: 1})
+        assert self.get_distribution(client, titles[0]['id']) == expected, (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'и удалении отзывов'
+        )
+        assert self.get_distribution(client, titles[1]['id']) == dict.fromkeys(
+            range(1, 11), 0
+        )
+        response = client.get('/api/v1/titles/999/rating-distribution/')
+        assert response.status_code == 404, (
+            'Проверьте, что для несуществующего произведения '
+            '`/api/v1/titles/{title_id}/rating-distribution/` '
+            'возвращает статус 404'
+        )
+
+
+class Test11TitleOrderingAPI:
+
+    def get_order(self, client, ordering):
+        url = f'/api/v1/titles/?ordering={ordering}'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` без токена авторизации '
+            'возвращается статус 200'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_ordering(self, client, admin_client, admin, settings):
+        settings.RATING_PRIOR_MEAN = 1
+        settings.RATING_PRIOR_COUNT = 10
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        auth_client(user).post(
+            f'/api/v1/titles/{second}/reviews/',
+            data={'text': 'Неплохо', 'score': 6}
+        )
+        assert self.get_order(client, '-rating') == [second, first], (
+            'Проверьте, что произведения можно отсортировать по рейтингу'
+        )
+        assert self.get_order(client, '-weighted_rating') == [
+            first, second
+        ], (
+            'Проверьте, что произведения можно отсортировать по байесовскому '
+            'рейтингу, учитывающему количество оценок'
+        )
+        assert self.get_order(client, '-review_count') == [first, second], (
+            'Проверьте, что произведения можно отсортировать по количеству '
+            'отзывов'
+        )
+        assert self.get_order(client, '-year') == [second, first], (
+            'Проверьте, что произведения можно отсортировать по году'
+        )
+        auth_client(moderator).post(
+            f'/api/v1/titles/{second}/reviews/',
+            data={'text': 'Отлично', 'score': 10}
+        )
+        assert self.get_order(client, '-weighted_rating') == [
+            second, first
+        ], (
+            'Проверьте, что байесовский рейтинг обновляется при добавлении '
+            'отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cursor_ordering_without_reviews(self, client, admin_client,
+                                                admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        Title.objects.bulk_create(
+            Title(name=f'Без отзывов {number}', year=2000)
+            for number in range(5)
+        )
+        for ordering in ('rating', '-rating', 'weighted_rating',
+                         '-weighted_rating'):
+            field = ordering.lstrip('-')
+            descending = ordering.startswith('-')
+            rated = sorted(
+                Title.objects.filter(**{f'{field}__isnull': False}),
+                key=lambda title: (getattr(title, field), title.pk),
+                reverse=descending
+            )
+            unrated = sorted(
+                Title.objects.filter(**{f'{field}__isnull': True}),
+                key=lambda title: title.pk,
+                reverse=descending
+            )
+            # Произведения без оценок идут как NULL в базе данных: в SQLite
+            # раньше остальных по возрастанию и позже по убыванию.
+            expected = [
+                title.pk for title in (
+                    rated + unrated if descending else unrated + rated
+                )
+            ]
+            url = f'/api/v1/titles/?cursor=&ordering={ordering}&limit=2'
+            paged = []
+            while url:
+                response = client.get(url)
+                assert response.status_code == 200, (
+                    f'Проверьте, что при GET запросе `{url}` по курсору '
+                    'возвращается статус 200'
+                )
+                data = response.json()
+                paged.extend(item['id'] for item in data['results'])
+                assert len(paged) <= len(expected)
+                url = data['next']
+            assert paged == expected, (
+                f'Проверьте, что при сортировке `{ordering}` по курсору '
+                'выдаются все произведения, в том числе без оценок'
+            )
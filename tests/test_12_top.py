@@ -0,0 +1,62 @@
+import pytest
+
+from .common import auth_client, create_reviews
+
+
+class Test12TopTitlesAPI:
+
+    def top(self, client, query=''):
+        url = f'/api/v1/titles/top/{query}'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` без токена авторизации '
+            'возвращается статус 200'
+        )
+        return [title['id'] for title in response.json()]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_top_titles(self, client, admin_client, admin, settings):
+        settings.LEADERBOARD_MIN_REVIEWS = 2
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert self.top(client) == [first], (
+            'Проверьте, что в `/api/v1/titles/top/` попадают только '
+            'произведения с достаточным количеством оценок'
+        )
+        for author in (user, moderator):
+            auth_client(author).post(
+                f'/api/v1/titles/{second}/reviews/',
+                data={'text': 'Отлично', 'score': 9}
+            )
+        assert self.top(client) == [second, first], (
+            'Проверьте, что `/api/v1/titles/top/` сортирует произведения по '
+            'рейтингу и обновляется при добавлении отзывов'
+        )
+        assert self.top(client, '?genre=drama') == [second], (
+            'Проверьте, что `/api/v1/titles/top/` фильтрует по жанру'
+        )
+        assert self.top(client, '?category=films&genre=horror') == [first], (
+            'Проверьте, что `/api/v1/titles/top/` фильтрует по категории и '
+            'жанру'
+        )
+        assert self.top(client, '?category=films&genre=drama') == []
+        assert self.top(client, '?n=1') == [second]
+        admin_client.patch(f'/api/v1/titles/{second}/', data={
+            'category': 'films', 'genre': ['horror']
+        })
+        assert self.top(client, '?category=films&genre=horror') == [
+            second, first
+        ], (
+            'Проверьте, что `/api/v1/titles/top/` обновляется при изменении '
+            'категории и жанров произведения'
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{first}/reviews/{reviews[0]["id"]}/'
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{first}/reviews/{reviews[1]["id"]}/'
+        )
+        assert self.top(client) == [second], (
+            'Проверьте, что произведения с недостаточным количеством оценок '
+            'убираются из `/api/v1/titles/top/`'
+        )
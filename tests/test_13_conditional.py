@@ -0,0 +1,106 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.versions import get_version
+from reviews.models import Title
+
+from .common import auth_client, create_comments
+
+
+class Test13ConditionalGetAPI:
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET запрос `{url}` содержит заголовки '
+            '`ETag` и `Last-Modified`'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET запрос `{url}` с актуальным `If-None-Match` '
+            'возвращает статус 304'
+        )
+        assert not context.captured_queries, (
+            f'Проверьте, что при ответе 304 на `{url}` не выполняются '
+            'запросы к базе данных'
+        )
+        assert response.get('ETag') == etag
+        return etag
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_not_modified(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        )
+        etags = {url: self.check_not_modified(client, url) for url in urls}
+        assert etags['/api/v1/titles/'] != self.check_not_modified(
+            client, '/api/v1/titles/?limit=1'
+        ), 'Проверьте, что `ETag` зависит от параметров запроса'
+
+        response = client.get(
+            '/api/v1/titles/',
+            HTTP_IF_MODIFIED_SINCE=client.get('/api/v1/titles/')[
+                'Last-Modified'
+            ]
+        )
+        assert response.status_code == 304, (
+            'Проверьте, что GET запрос с актуальным `If-Modified-Since` '
+            'возвращает статус 304'
+        )
+
+        auth_client(user).post(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            data={'text': 'Новый комментарий'}
+        )
+        changed = f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        response = client.get(changed, HTTP_IF_NONE_MATCH=etags[changed])
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения данных GET запрос с прежним '
+            '`If-None-Match` возвращает статус 200'
+        )
+        assert response['ETag'] != etags[changed]
+        url = '/api/v1/categories/'
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == 304, (
+            'Проверьте, что `ETag` не меняется при изменении несвязанных '
+            'данных'
+        )
+        admin_client.delete('/api/v1/categories/films/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_version_after_commit(self):
+        version = get_version('titles')
+        with transaction.atomic():
+            Title.objects.create(name='Новое', year=2000)
+            assert get_version('titles') == version, (
+                'Проверьте, что версия данных меняется только после '
+                'фиксации транзакции'
+            )
+        assert get_version('titles') != version
+        version = get_version('titles')
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Title.objects.create(name='Откат', year=2000)
+                raise RuntimeError
+        assert get_version('titles') == version, (
+            'Проверьте, что при откате транзакции версия данных не меняется'
+        )
@@ -0,0 +1,124 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import (auth_client, create_categories, create_genre,
+                     create_users_api)
+
+URL = '/api/v1/titles/bulk/'
+
+
+def make_titles(count):
+    return [
+        {
+            'name': f'Произведение {number}',
+            'year': 2000 + number % 20,
+            'category': ('films', 'books')[number % 2],
+            'genre': ['horror', 'drama'] if number % 3 else ['comedy'],
+        }
+        for number in range(count)
+    ]
+
+
+def post_titles(admin_client, titles):
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.post(URL, data=titles, format='json')
+    assert response.status_code == 201, (
+        f'Проверьте, что при POST запросе `{URL}` администратором '
+        'возвращается статус 201'
+    )
+    return response.json(), len(context.captured_queries)
+
+
+class Test14BulkTitlesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_create(self, client, admin_client):
+        create_categories(admin_client)
+        create_genre(admin_client)
+        created, queries = post_titles(admin_client, make_titles(300))
+        assert queries <= 20, (
+            f'Проверьте, что при POST запросе `{URL}` произведения и жанры '
+            'сохраняются пакетами, а не по одному: выполнено '
+            f'{queries} запросов к базе данных'
+        )
+        assert len(created) == 300
+        assert [title['name'] for title in created] == [
+            title['name'] for title in make_titles(300)
+        ]
+        title = created[4]
+        assert title['category']['slug'] == 'films'
+        assert {genre['slug'] for genre in title['genre']} == {
+            'horror', 'drama'
+        }
+        response = client.get(f'/api/v1/titles/{title["id"]}/')
+        assert response.json()['name'] == title['name'], (
+            f'Проверьте, что POST запрос `{URL}` сохраняет произведения'
+        )
+        response = client.get('/api/v1/titles/?genre=comedy&limit=1')
+        assert response.json()['count'] == 100, (
+            f'Проверьте, что POST запрос `{URL}` сохраняет жанры '
+            'произведений'
+        )
+        response = client.get('/api/v1/titles/?name=Произведение 299')
+        assert response.json()['count'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_validation(self, client, admin_client, admin):
+        create_categories(admin_client)
+        create_genre(admin_client)
+        titles = make_titles(3)
+        titles[1]['genre'] = ['horror', 'unknown']
+        titles[2]['category'] = 'unknown'
+        response = admin_client.post(URL, data=titles, format='json')
+        assert response.status_code == 400, (
+            f'Проверьте, что при POST запросе `{URL}` с несуществующими '
+            'слагами возвращается статус 400'
+        )
+        errors = response.json()
+        assert not errors[0] and 'genre' in errors[1] and (
+            'category' in errors[2]
+        ), (
+            'Проверьте, что ошибки возвращаются для каждого произведения'
+        )
+        assert client.get('/api/v1/titles/').json()['count'] == 0, (
+            'Проверьте, что при ошибке не сохраняется ни одно произведение'
+        )
+        user, moderator = create_users_api(admin_client)
+        response = auth_client(moderator).post(
+            URL, data=make_titles(1), format='json'
+        )
+        assert response.status_code == 403, (
+            f'Проверьте, что POST запрос `{URL}` доступен только '
+            'администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bulk_update(self, client, admin_client):
+        create_categories(admin_client)
+        create_genre(admin_client)
+        created, queries = post_titles(admin_client, make_titles(4))
+        response = admin_client.patch(URL, data=[
+            {'id': created[0]['id'], 'name': 'Новое название'},
+            {'id': created[1]['id'], 'genre': ['comedy'],
+             'category': 'films'},
+        ], format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что при PATCH запросе `{URL}` администратором '
+            'возвращается статус 200'
+        )
+        first = client.get(f'/api/v1/titles/{created[0]["id"]}/').json()
+        second = client.get(f'/api/v1/titles/{created[1]["id"]}/').json()
+        assert first['name'] == 'Новое название'
+        assert first['year'] == created[0]['year']
+        assert [genre['slug'] for genre in second['genre']] == ['comedy']
+        assert second['category']['slug'] == 'films', (
+            f'Проверьте, что PATCH запрос `{URL}` изменяет произведения'
+        )
+        response = admin_client.patch(
+            URL, data=[{'id': 999999, 'name': 'Нет'}], format='json'
+        )
+        assert response.status_code == 400, (
+            f'Проверьте, что PATCH запрос `{URL}` с несуществующим id '
+            'возвращает статус 400'
+        )
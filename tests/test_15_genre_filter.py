@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test15GenreFilterAPI:
+
+    def filter_titles(self, client, query):
+        url = f'/api/v1/titles/?{query}'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        assert not any(
+            'reviews_titlesgenres' in query['sql']
+            for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_title"')
+        ), (
+            f'Проверьте, что при GET запросе `{url}` произведения '
+            'фильтруются по жанрам без JOIN с таблицей связей'
+        )
+        return sorted(title['id'] for title in response.json()['results'])
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_genre_modes(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        cases = (
+            ('genre=horror,drama', [first, second]),
+            ('genre=horror,drama&genre_mode=any', [first, second]),
+            ('genre=horror,drama&genre_mode=all', []),
+            ('genre=horror,comedy&genre_mode=all', [first]),
+            ('genre=drama,unknown', [second]),
+            ('genre=drama,unknown&genre_mode=all', []),
+            ('genre=comedy&category=films', [first]),
+        )
+        for query, expected in cases:
+            assert self.filter_titles(client, query) == expected, (
+                f'Проверьте, что фильтр `?{query}` возвращает произведения '
+                'с нужными жанрами'
+            )
+        response = client.get('/api/v1/titles/?genre=drama&genre_mode=xor')
+        assert response.status_code == 400, (
+            'Проверьте, что при неизвестном значении `genre_mode` '
+            'возвращается статус 400'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_genre_mask_updates(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        admin_client.patch(
+            f'/api/v1/titles/{second}/', data={'genre': ['horror', 'drama']}
+        )
+        assert self.filter_titles(
+            client, 'genre=horror,drama&genre_mode=all'
+        ) == [second], (
+            'Проверьте, что фильтр по жанрам учитывает изменение жанров '
+            'произведения'
+        )
+        admin_client.delete('/api/v1/genres/horror/')
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'}
+        )
+        assert self.filter_titles(client, 'genre=new') == [], (
+            'Проверьте, что после удаления жанра его произведения не '
+            'попадают в фильтр по новому жанру'
+        )
+        assert self.filter_titles(client, 'genre=drama') == [second]
+        assert self.filter_titles(
+            client, 'genre=comedy,drama&genre_mode=any'
+        ) == [first, second]
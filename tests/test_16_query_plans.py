@@ -0,0 +1,80 @@
+import re
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import TitlesGenres
+
+from .common import auth_client, create_comments
+
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?(?P<table>\w+)$')
+
+
+def get_full_scans(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        plan = [row[-1] for row in cursor.fetchall()]
+    return [detail for detail in plan if FULL_SCAN.match(detail)]
+
+
+class Test16QueryPlans:
+
+    def check_no_full_scans(self, client, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and ' WHERE ' in query['sql']
+        ]
+        assert queries
+        for sql in queries:
+            scans = get_full_scans(sql)
+            assert not scans, (
+                f'Проверьте, что при GET запросе `{url}` запросы к базе '
+                f'данных используют индексы: {scans} в запросе {sql}'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_hot_queries_use_indexes(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        urls = (
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/?cursor=',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            '?cursor=',
+            '/api/v1/titles/?category=films',
+            '/api/v1/titles/?year=2000',
+            '/api/v1/titles/?category=films&ordering=-rating',
+            '/api/v1/titles/?year=2000&ordering=-year',
+        )
+        for url in urls:
+            self.check_no_full_scans(client, url)
+        self.check_no_full_scans(
+            auth_client(admin), f'/api/v1/users/{user.username}/'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_genres_indexes(self, client, admin_client, admin):
+        create_comments(admin_client, admin)
+        for queryset in (
+            TitlesGenres.objects.filter(genre_id=1).values('title_id'),
+            TitlesGenres.objects.filter(title_id=1, genre_id=1),
+        ):
+            sql = str(queryset.query)
+            assert not get_full_scans(sql), (
+                'Проверьте, что для таблицы связей произведений с жанрами '
+                f'есть индексы: {sql}'
+            )
@@ -0,0 +1,65 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews
+from .test_16_query_plans import get_full_scans
+
+
+class Test17RangeFiltersAPI:
+
+    def filter_titles(self, client, query):
+        url = f'/api/v1/titles/?{query}'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        return sorted(title['id'] for title in response.json()['results'])
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_year_and_rating_ranges(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        auth_client(user).post(
+            f'/api/v1/titles/{second}/reviews/',
+            data={'text': 'Отлично', 'score': 9}
+        )
+        cases = (
+            ('year_min=2000&year_max=2010', [first]),
+            ('year_min=2001', [second]),
+            ('year_max=2020', [first, second]),
+            ('rating_min=8', [second]),
+            ('rating_max=4', [first]),
+            ('rating_min=3&rating_max=9', [first, second]),
+            ('year_min=2010&rating_min=8&category=books', [second]),
+            ('year_min=2010&rating_max=5', []),
+        )
+        for query, expected in cases:
+            assert self.filter_titles(client, query) == expected, (
+                f'Проверьте, что фильтр `?{query}` возвращает произведения '
+                'из нужного диапазона'
+            )
+        response = client.get('/api/v1/titles/?year_min=abc')
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_range_filters_use_indexes(self, client, admin_client, admin):
+        create_reviews(admin_client, admin)
+        queries = (
+            'year_min=1990&year_max=1999',
+            'year_min=1990&year_max=1999&rating_min=8',
+            'rating_min=8&ordering=-rating',
+            'year_min=2001&ordering=-year',
+            'category=films&rating_min=8',
+        )
+        for query in queries:
+            url = f'/api/v1/titles/?{query}'
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                client.get(url)
+            for sql in context.captured_queries:
+                if ' WHERE ' in sql['sql']:
+                    assert not get_full_scans(sql['sql']), (
+                        f'Проверьте, что фильтр `{url}` использует индекс'
+                    )
@@ -0,0 +1,127 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+from .test_16_query_plans import get_full_scans
+
+
+class Test18FeedsAPI:
+
+    def get_feed(self, client, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` без токена '
+            'возвращается статус 200'
+        )
+        return response.json(), context.captured_queries
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_feed(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        response = auth_client(user).post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Отлично', 'score': 9}
+        )
+        newest = response.json()['id']
+        data, queries = self.get_feed(client, '/api/v1/reviews/')
+        assert 'next' in data and 'results' in data, (
+            'Проверьте, что лента `/api/v1/reviews/` возвращает данные с '
+            'пагинацией по курсору'
+        )
+        results = data['results']
+        assert [review['id'] for review in results] == [
+            newest, *sorted((review['id'] for review in reviews),
+                            reverse=True)
+        ], (
+            'Проверьте, что лента `/api/v1/reviews/` выдает отзывы всех '
+            'произведений от новых к старым'
+        )
+        assert results[0]['title'] == titles[1]['id']
+        assert results[0]['title_name'] == titles[1]['name'], (
+            'Проверьте, что в ленте отзывов есть название произведения'
+        )
+        assert results[0]['author'] == user.username, (
+            'Проверьте, что в ленте отзывов есть username автора'
+        )
+        assert len(queries) == 1, (
+            'Проверьте, что лента отзывов загружается одним запросом к '
+            'базе данных, с произведением и автором через JOIN'
+        )
+        assert not get_full_scans(queries[0]['sql']), (
+            'Проверьте, что лента отзывов использует индекс по pub_date'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_feed_cursor(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        expected = sorted((review['id'] for review in reviews), reverse=True)
+        url = '/api/v1/reviews/?limit=2'
+        ids = []
+        while url:
+            data, queries = self.get_feed(client, url)
+            assert len(data['results']) <= 2
+            assert len(queries) == 1, (
+                'Проверьте, что каждая страница ленты загружается одним '
+                'запросом к базе данных'
+            )
+            ids.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert ids == expected, (
+            'Проверьте, что страницы ленты по курсору выдают все отзывы '
+            'без повторов и пропусков'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_comments_feed(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        data, queries = self.get_feed(client, '/api/v1/comments/')
+        results = data['results']
+        assert [comment['id'] for comment in results] == sorted(
+            (comment['id'] for comment in comments), reverse=True
+        ), (
+            'Проверьте, что лента `/api/v1/comments/` выдает комментарии '
+            'от новых к старым'
+        )
+        assert results[0]['review'] == reviews[0]['id']
+        assert results[0]['title'] == titles[0]['id']
+        assert results[0]['title_name'] == titles[0]['name'], (
+            'Проверьте, что в ленте комментариев есть название произведения'
+        )
+        assert results[0]['author'] == moderator.username
+        assert len(queries) == 1, (
+            'Проверьте, что лента комментариев загружается одним запросом '
+            'к базе данных'
+        )
+        response = client.post('/api/v1/comments/', data={'text': 'abc'})
+        assert response.status_code in (401, 405), (
+            'Проверьте, что лента комментариев доступна только для чтения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_feed_conditional_get(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        response = client.get('/api/v1/comments/')
+        etag = response['ETag']
+        response = client.get('/api/v1/comments/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[1]["id"]}/comments/',
+            data={'text': 'Новый'}
+        )
+        response = client.get('/api/v1/comments/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый комментарий меняет ETag ленты комментариев'
+        )
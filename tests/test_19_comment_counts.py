@@ -0,0 +1,116 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comments, Review, Title
+
+from .common import auth_client, create_comments
+
+
+class Test19CommentCountsAPI:
+
+    def get_reviews(self, client, title_id):
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        return {review['id']: review for review in response.json()['results']}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_comments_count(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        data = self.get_reviews(client, title_id)
+        assert data[review_id]['comments_count'] == len(comments), (
+            'Проверьте, что в отзыве выводится количество комментариев '
+            '`comments_count`'
+        )
+        last_comment = client.get(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        ).json()['results'][0]
+        assert data[review_id]['last_comment_date'] == (
+            last_comment['pub_date']
+        ), (
+            'Проверьте, что в отзыве выводится дата последнего комментария '
+            '`last_comment_date`'
+        )
+        other = reviews[1]['id']
+        assert data[other]['comments_count'] == 0
+        assert data[other]['last_comment_date'] is None, (
+            'Проверьте, что у отзыва без комментариев `last_comment_date` '
+            'равно None'
+        )
+        url = f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        response = auth_client(moderator).delete(
+            f'{url}{last_comment["id"]}/'
+        )
+        assert response.status_code == 204
+        data = self.get_reviews(client, title_id)
+        assert data[review_id]['comments_count'] == len(comments) - 1, (
+            'Проверьте, что при удалении комментария уменьшается '
+            '`comments_count` отзыва'
+        )
+        review = Review.objects.get(pk=review_id)
+        assert review.last_comment_date == review.comments.latest(
+            'pub_date'
+        ).pub_date, (
+            'Проверьте, что при удалении последнего комментария '
+            '`last_comment_date` берется из оставшихся комментариев'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_no_extra_queries(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        assert not any(
+            '"reviews_comments"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что количество комментариев берется из отзыва без '
+            'запросов к таблице комментариев'
+        )
+        auth_client(user).post(
+            f'{url}{reviews[0]["id"]}/comments/',
+            data={'text': 'Еще один'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый комментарий меняет ETag списка отзывов'
+        )
+        data = {review['id']: review for review in response.json()['results']}
+        assert data[reviews[0]['id']]['comments_count'] == len(comments) + 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_delete_review_with_comments(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        review = Review.objects.get(pk=reviews[0]['id'])
+        Comments.objects.bulk_create(
+            Comments(review=review, author=user, text=f'Комментарий {number}')
+            for number in range(50)
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{review.pk}/'
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.delete(url)
+        assert response.status_code == 204
+        assert not Comments.objects.filter(review_id=review.pk).exists()
+        assert len(context.captured_queries) < 30, (
+            'Проверьте, что при удалении отзыва его комментарии удаляются '
+            'без отдельных запросов на каждый комментарий'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (7, 2), (
+            'Проверьте, что при удалении отзыва пересчитывается рейтинг '
+            'произведения'
+        )
@@ -0,0 +1,204 @@
+import asyncio
+import json
+
+import pytest
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api_yamdb.asgi import application
+from core.asgi import build_environ
+from core.events import get_broker
+from core.sse import EventStream
+
+from .common import auth_client, create_reviews
+
+TIMEOUT = 5
+
+
+class ASGIClient:
+
+    def __init__(self, app, path, method='GET', headers=(), body=b''):
+        self.sent = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.body = body
+        scope = {'type': 'http', 'method': method, 'path': path,
+                 'headers': list(headers), 'query_string': b''}
+        self.task = asyncio.ensure_future(app(scope, self.receive, self.send))
+
+    async def receive(self):
+        if self.body is not None:
+            body, self.body = self.body, None
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        await self.sent.put(message)
+
+    async def next(self):
+        return await asyncio.wait_for(self.sent.get(), TIMEOUT)
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, TIMEOUT)
+
+
+def parse_event(message):
+    lines = message['body'].decode('utf-8').strip().split('\n')
+    event = lines[0][len('event: '):]
+    return event, json.loads(lines[1][len('data: '):])
+
+
+class Test20EventsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_and_comment_events(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title_id = titles[1]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        async def scenario():
+            client = ASGIClient(
+                application, f'/api/v1/titles/{title_id}/events/'
+            )
+            start = await client.next()
+            assert start['status'] == 200, (
+                'Проверьте, что поток событий произведения отвечает 200'
+            )
+            assert (b'content-type', b'text/event-stream; charset=utf-8') in (
+                start['headers']
+            ), 'Проверьте, что поток событий отдается как text/event-stream'
+            assert (await client.next())['body'].startswith(b':')
+            response = auth_client(user).post(
+                url, data={'text': 'Отлично', 'score': 9}
+            )
+            review = await client.next()
+            auth_client(user).post(
+                f'{url}{response.json()["id"]}/comments/',
+                data={'text': 'Согласен'}
+            )
+            comment = await client.next()
+            await client.close()
+            return response.json(), review, comment
+
+        created, review, comment = asyncio.run(scenario())
+        event, data = parse_event(review)
+        assert event == 'review' and data == created, (
+            'Проверьте, что при создании отзыва в поток произведения '
+            'приходит событие review с данными отзыва'
+        )
+        event, data = parse_event(comment)
+        assert event == 'comment', (
+            'Проверьте, что при создании комментария в поток произведения '
+            'приходит событие comment'
+        )
+        assert data['review'] == created['id']
+        assert data['text'] == 'Согласен'
+        assert data['author'] == user.username
+        assert not get_broker()._subscriptions, (
+            'Проверьте, что после отключения клиента подписка удаляется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_other_titles_and_errors(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+
+        async def scenario():
+            client = ASGIClient(
+                application, f'/api/v1/titles/{titles[0]["id"]}/events/'
+            )
+            await client.next()
+            await client.next()
+            auth_client(user).post(
+                f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+                data={'text': 'Отлично', 'score': 9}
+            )
+            await asyncio.sleep(0.1)
+            other = client.sent.qsize()
+            await client.close()
+            statuses = []
+            for path, method in (('/api/v1/titles/0/events/', 'GET'),
+                                 ('/api/v1/unknown/', 'GET'),
+                                 (f'/api/v1/titles/{titles[0]["id"]}/'
+                                  'events/', 'POST')):
+                client = ASGIClient(application, path, method)
+                statuses.append((await client.next())['status'])
+                await client.close()
+            return other, statuses
+
+        other, statuses = asyncio.run(scenario())
+        assert other == 0, (
+            'Проверьте, что в поток произведения не попадают события других '
+            'произведений'
+        )
+        assert statuses == [404, 404, 405], (
+            'Проверьте, что поток событий несуществующего произведения и '
+            'неизвестный путь возвращают 404, а POST запрос - 405'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_api_in_same_process(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title_id = titles[1]['id']
+        token = RefreshToken.for_user(user).access_token
+        headers = [
+            (b'authorization', f'Bearer {token}'.encode()),
+            (b'content-type', b'application/json'),
+        ]
+
+        async def scenario():
+            stream = ASGIClient(
+                application, f'/api/v1/titles/{title_id}/events/'
+            )
+            await stream.next()
+            await stream.next()
+            client = ASGIClient(
+                application, f'/api/v1/titles/{title_id}/reviews/', 'POST',
+                headers,
+                json.dumps({'text': 'Отлично', 'score': 9}).encode('utf-8')
+            )
+            start = await client.next()
+            body = (await client.next())['body']
+            await client.close()
+            review = await stream.next()
+            await stream.close()
+            return start, json.loads(body), review
+
+        start, created, review = asyncio.run(scenario())
+        assert start['status'] == 201, (
+            'Проверьте, что ASGI приложение передает запросы API в Django'
+        )
+        assert (b'content-type', b'application/json') in start['headers']
+        event, data = parse_event(review)
+        assert event == 'review' and data == created, (
+            'Проверьте, что отзыв, созданный через ASGI приложение, приходит '
+            'в поток произведения того же процесса'
+        )
+
+    def test_04_heartbeat(self):
+
+        async def get_channel(scope):
+            return 'heartbeat'
+
+        async def scenario():
+            client = ASGIClient(EventStream(get_channel, heartbeat=0.01), '/')
+            messages = [await client.next() for _ in range(3)]
+            await client.close()
+            return messages
+
+        messages = asyncio.run(scenario())
+        assert messages[2]['body'] == b': ping\n\n', (
+            'Проверьте, что без событий в поток отправляется комментарий '
+            'для поддержания соединения'
+        )
+
+    def test_05_repeated_headers(self):
+        environ = build_environ({
+            'type': 'http', 'method': 'GET', 'path': '/api/v1/titles/',
+            'headers': [(b'cookie', b'a=1'), (b'cookie', b'b=2'),
+                        (b'accept', b'text/html'),
+                        (b'accept', b'application/json')],
+        }, b'')
+        assert environ['HTTP_COOKIE'] == 'a=1; b=2', (
+            'Проверьте, что повторные заголовки Cookie склеиваются через "; "'
+        )
+        assert environ['HTTP_ACCEPT'] == 'text/html,application/json'
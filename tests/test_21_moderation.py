@@ -0,0 +1,127 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comments, Review
+from reviews.moderation import delete_comments
+
+from .common import auth_client, create_comments
+
+
+class Test21BulkModerationAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_permissions_and_validation(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        url = '/api/v1/search/reviews/delete/'
+        response = auth_client(user).post(
+            url, data={'ids': [reviews[0]['id']]}, format='json'
+        )
+        assert response.status_code == 403, (
+            f'Проверьте, что `{url}` недоступен обычному пользователю'
+        )
+        response = auth_client(moderator).post(url, data={}, format='json')
+        assert response.status_code == 400, (
+            f'Проверьте, что `{url}` без ids и author возвращает 400'
+        )
+        assert Review.objects.count() == len(reviews)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_delete_reviews(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        deleted = [reviews[0]['id'], reviews[1]['id']]
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client(moderator).post(
+                '/api/v1/search/reviews/delete/',
+                data={'ids': deleted}, format='json'
+            )
+        assert response.status_code == 200
+        assert response.json() == {'deleted': 2}, (
+            'Проверьте, что пакетное удаление отзывов возвращает количество '
+            'удаленных отзывов'
+        )
+        assert list(Review.objects.values_list('pk', flat=True)) == [
+            reviews[2]['id']
+        ]
+        assert not Comments.objects.exists(), (
+            'Проверьте, что вместе с отзывами удаляются их комментарии'
+        )
+        row_deletes = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('DELETE FROM "reviews_review"')
+            or query['sql'].startswith('DELETE FROM "reviews_comments"')
+        ]
+        assert len(row_deletes) == 2, (
+            'Проверьте, что отзывы и комментарии удаляются пакетами, '
+            'а не по одному'
+        )
+        title = client.get(f'/api/v1/titles/{title_id}/').json()
+        assert title['rating'] == 4, (
+            'Проверьте, что после пакетного удаления отзывов пересчитывается '
+            'рейтинг произведения'
+        )
+        distribution = client.get(
+            f'/api/v1/titles/{title_id}/rating-distribution/'
+        ).json()
+        assert sum(distribution.values()) == 1
+        top = client.get('/api/v1/titles/top/').json()
+        assert title_id not in [item['id'] for item in top], (
+            'Проверьте, что после пакетного удаления отзывов обновляется '
+            'рейтинг лучших произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_delete_comments_by_author(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        response = auth_client(moderator).post(
+            '/api/v1/search/comments/delete/',
+            data={'author': user.username}, format='json'
+        )
+        assert response.status_code == 200
+        assert response.json() == {'deleted': 1}, (
+            'Проверьте, что пакетное удаление комментариев по автору '
+            'удаляет только его комментарии'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        data = {review['id']: review for review in response.json()['results']}
+        assert data[reviews[0]['id']]['comments_count'] == len(comments) - 1, (
+            'Проверьте, что после пакетного удаления комментариев '
+            'пересчитывается `comments_count` отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_delete_in_chunks(self, admin_client, admin, monkeypatch):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        review = Review.objects.get(pk=reviews[0]['id'])
+        Comments.objects.bulk_create(
+            Comments(review=review, author=user, text=f'Комментарий {number}')
+            for number in range(5)
+        )
+        monkeypatch.setattr('reviews.deletion.DELETE_BATCH_SIZE', 2)
+        with CaptureQueriesContext(connection) as context:
+            deleted = delete_comments(Comments.objects.filter(author=user))
+        assert deleted == 6
+        deletes = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('DELETE FROM "reviews_comments"')
+        ]
+        assert len(deletes) == 3, (
+            'Проверьте, что комментарии удаляются частями'
+        )
+        review.refresh_from_db()
+        assert review.comments_count == len(comments) - 1, (
+            'Проверьте, что после удаления частями пересчитывается '
+            '`comments_count` отзыва'
+        )
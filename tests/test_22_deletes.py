@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews import deletion
+from reviews.models import (Comments, Review, Title, TitleRanking, TitleScore,
+                            TitlesGenres)
+
+from .common import create_comments
+
+
+class Test22ChunkedDeletesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_delete_title(self, client, admin_client, admin, monkeypatch):
+        monkeypatch.setattr(deletion, 'DELETE_BATCH_SIZE', 2)
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.delete(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 204
+        for model, lookup in ((Review, 'title_id'),
+                              (Comments, 'review__title_id'),
+                              (TitleScore, 'title_id'),
+                              (TitleRanking, 'title_id'),
+                              (TitlesGenres, 'title_id')):
+            assert not model.objects.filter(**{lookup: title_id}).exists(), (
+                'Проверьте, что при удалении произведения удаляются '
+                f'связанные строки {model.__name__}'
+            )
+        assert Title.objects.filter(pk=titles[1]['id']).exists()
+        sql = [query['sql'] for query in context.captured_queries]
+        review_deletes = [
+            query for query in sql
+            if query.startswith('DELETE FROM "reviews_review"')
+        ]
+        assert len(review_deletes) == 2, (
+            'Проверьте, что отзывы произведения удаляются частями по '
+            'DELETE_BATCH_SIZE без загрузки объектов в память'
+        )
+        assert all(query.count(',') < 2 for query in review_deletes)
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 404
+        response = client.get('/api/v1/reviews/')
+        assert title_id not in [
+            review['title'] for review in response.json()['results']
+        ], 'Проверьте, что после удаления произведения обновляется лента'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_delete_category(self, client, admin_client, admin,
+                                monkeypatch):
+        monkeypatch.setattr(deletion, 'DELETE_BATCH_SIZE', 1)
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        response = admin_client.delete('/api/v1/categories/films/')
+        assert response.status_code == 204
+        title = client.get(f'/api/v1/titles/{title_id}/').json()
+        assert title['category'] is None, (
+            'Проверьте, что после удаления категории у ее произведений '
+            'категория становится пустой'
+        )
+        assert not TitleRanking.objects.filter(
+            category__isnull=False, title_id=title_id
+        ).exists()
+        assert Review.objects.filter(title_id=title_id).count() == len(reviews)
+        response = client.get('/api/v1/titles/?category=films')
+        assert response.json()['results'] == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_delete_genre(self, client, admin_client, admin, monkeypatch):
+        monkeypatch.setattr(deletion, 'DELETE_BATCH_SIZE', 1)
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        response = admin_client.delete('/api/v1/genres/horror/')
+        assert response.status_code == 204
+        title = client.get(f'/api/v1/titles/{title_id}/').json()
+        assert [genre['slug'] for genre in title['genre']] == ['comedy'], (
+            'Проверьте, что после удаления жанра он убирается у произведений'
+        )
+        response = client.get('/api/v1/titles/?genre=comedy')
+        assert [item['id'] for item in response.json()['results']] == [
+            title_id
+        ], 'Проверьте, что после удаления жанра фильтр по жанрам работает'
+        assert Title.objects.get(pk=title_id).genre_mask == sum(
+            1 << bit for bit in Title.objects.get(
+                pk=title_id
+            ).genre.values_list('bit', flat=True)
+        ), 'Проверьте, что после удаления жанра пересчитывается маска жанров'
+        assert not TitleRanking.objects.filter(
+            genre__slug='horror'
+        ).exists()
@@ -0,0 +1,174 @@
+import time
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count
+
+from reviews.models import Comments, Review, Title, TitleScore, User
+from reviews.purge import (UserPurge, get_purge_progress, purge_user,
+                           request_user_purge)
+
+from .common import auth_client, create_comments, create_reviews
+
+TIMEOUT = 5
+
+
+class Test23UserPurgeAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_delete_user_with_content(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_id = titles[0]['id']
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert not User.objects.filter(pk=user.pk).exists(), (
+            'Проверьте, что пользователь удаляется после удаления его '
+            'данных'
+        )
+        assert not Review.objects.filter(author_id=user.pk).exists()
+        assert not Comments.objects.filter(author_id=user.pk).exists(), (
+            'Проверьте, что при удалении пользователя удаляются его отзывы '
+            'и комментарии'
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating, title.rating_count) == (4.5, 2), (
+            'Проверьте, что после удаления пользователя пересчитывается '
+            'рейтинг произведений с его отзывами'
+        )
+        data = client.get(f'/api/v1/titles/{title_id}/reviews/').json()
+        review = next(
+            item for item in data['results']
+            if item['id'] == reviews[0]['id']
+        )
+        assert review['comments_count'] == len(comments) - 1, (
+            'Проверьте, что после удаления пользователя пересчитывается '
+            'количество комментариев к отзывам'
+        )
+        response = admin_client.get(f'/api/v1/users/{user.username}/purge/')
+        assert response.status_code == 200
+        assert response.json() == {
+            'status': 'done',
+            'comments': {'deleted': 1, 'total': 1},
+            'reviews': {'deleted': 1, 'total': 1},
+        }, 'Проверьте, что выводится ход удаления пользователя'
+        response = admin_client.get('/api/v1/users/unknown/purge/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_background_purge(self, admin_client, admin, settings):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        user_client = auth_client(user)
+        settings.BACKGROUND_JOBS_EAGER = False
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        deadline = time.monotonic() + TIMEOUT
+        while (get_purge_progress(user.username) or {}).get(
+            'status'
+        ) != 'done':
+            assert time.monotonic() < deadline, (
+                'Проверьте, что данные пользователя удаляются в фоне'
+            )
+            time.sleep(0.05)
+        assert not User.objects.filter(pk=user.pk).exists()
+        response = user_client.get('/api/v1/titles/')
+        assert response.status_code == 401, (
+            'Проверьте, что удаленный пользователь не может пользоваться '
+            'своим токеном'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_deactivated_immediately(self, admin_client, admin,
+                                        settings):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        settings.BACKGROUND_JOBS_EAGER = False
+        with transaction.atomic():
+            # Пока транзакция не зафиксирована, задача не запускается.
+            request_user_purge(user)
+            user.refresh_from_db()
+            assert not user.is_active and user.deleted_at is not None
+            assert get_purge_progress(user.username) == {'status': 'pending'}
+            response = admin_client.get(f'/api/v1/users/{user.username}/')
+            assert response.status_code == 404, (
+                'Проверьте, что удаляемый пользователь сразу пропадает '
+                'из API'
+            )
+            settings.BACKGROUND_JOBS_EAGER = True
+        assert not User.objects.filter(pk=user.pk).exists()
+        assert Review.objects.count() == len(reviews) - 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_purge_command(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        User.objects.filter(pk=moderator.pk).update(
+            is_active=False, deleted_at='2026-01-01T00:00:00Z'
+        )
+        call_command('purgeusers')
+        assert not User.objects.filter(pk=moderator.pk).exists(), (
+            'Проверьте, что команда purgeusers удаляет помеченных '
+            'пользователей'
+        )
+        assert not Review.objects.filter(author_id=moderator.pk).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_resume_after_failure(self, admin_client, admin,
+                                     monkeypatch):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Отлично', 'score': 10}
+        )
+        admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Плохо', 'score': 2}
+        )
+        User.objects.filter(pk=user.pk).update(
+            is_active=False, deleted_at='2026-01-01T00:00:00Z'
+        )
+        monkeypatch.setattr('reviews.deletion.DELETE_BATCH_SIZE', 1)
+        delete_reviews = UserPurge.delete_reviews
+        calls = []
+
+        def fail_second_chunk(self, rows):
+            calls.append(rows)
+            if len(calls) == 2:
+                raise RuntimeError('сбой')
+            delete_reviews(self, rows)
+
+        monkeypatch.setattr(UserPurge, 'delete_reviews', fail_second_chunk)
+        with pytest.raises(RuntimeError):
+            purge_user(user.pk)
+        assert Review.objects.filter(author_id=user.pk).count() == 1
+        monkeypatch.setattr(UserPurge, 'delete_reviews', delete_reviews)
+        purge_user(user.pk)
+        assert not User.objects.filter(pk=user.pk).exists()
+        for title in Title.objects.filter(
+            pk__in=[title['id'] for title in titles]
+        ):
+            scores = list(Review.objects.filter(title=title).values_list(
+                'score', flat=True
+            ))
+            assert (title.rating_sum, title.rating_count) == (
+                sum(scores), len(scores)
+            ), (
+                'Проверьте, что после повторного запуска удаления рейтинг '
+                'произведений совпадает с оставшимися отзывами'
+            )
+            expected = dict(Review.objects.filter(title=title).values(
+                'score'
+            ).annotate(count=Count('pk')).values_list('score', 'count'))
+            actual = dict(TitleScore.objects.filter(
+                title=title, count__gt=0
+            ).values_list('score', 'count'))
+            assert actual == expected, (
+                'Проверьте, что после повторного запуска удаления '
+                'пересчитывается распределение оценок'
+            )